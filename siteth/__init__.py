@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+__author__ = "Author: Chaddy Huussin <chaddy.hv@gmail.com>"
+
+# Keep `import siteth` cheap, the API and its dependencies are only loaded on first use
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    import importlib
+    return getattr(importlib.import_module('siteth.api'), name)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from siteth.config import GETH
+
+
+def create_account(workspace, account, light_kdf=False):
+    # Runs a single `geth account new` against net-info keystore using account-N.pass
+    passPath = os.path.join(workspace, 'net-info', 'accounts', 'account-{}.pass'.format(account))
+    command = [GETH, '--datadir', os.path.join(workspace, 'net-info'), 'account', 'new', '--password', passPath]
+    if light_kdf:
+        command.insert(1, '--lightkdf')
+    output = subprocess.run(command, stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+    accountAddress = output.replace("Address: {", "").replace("}", "").replace("\n", "")
+    accountAddress = accountAddress.replace("Your new key was generatedPublic address of the key:   ", "").replace(
+        "Path of the secret key file", "")
+    if ":" in accountAddress:
+        accountAddress = accountAddress.split(":")[0]
+
+    if not accountAddress.startswith("0x"):
+        accountAddress = "0x{}".format(accountAddress)
+
+    with open(passPath, 'r') as passFile:
+        return {'account': accountAddress, 'pass': passFile.read()}
+
+
+def generate_accounts(workspace, total, workers=None, light_kdf=False):
+    # scrypt dominates `geth account new`, spread it over a bounded pool sized to the cores
+    workers = max(1, min(workers or os.cpu_count() or 1, total))
+    if light_kdf:
+        logging.warning("Using light KDF for account keys, only use for throwaway networks")
+    logging.info("Generating {} accounts using {} workers".format(total, workers))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        accounts = list(pool.map(lambda account: create_account(workspace, account, light_kdf),
+                                 range(1, total + 1)))
+
+    with open(os.path.join(workspace, 'net-info', 'accounts.json'), 'w') as accountsFile:
+        accountsFile.write(json.dumps(accounts))
+    shutil.rmtree(os.path.join(workspace, 'net-info', 'accounts'))
+    os.mkdir(os.path.join(workspace, 'net-info', 'accounts'))
+    for account in accounts:
+        with open(os.path.join(workspace, 'net-info', 'accounts',
+                               '{}.pass'.format(account['account'].replace('0x', ''))), 'w') as passWrite:
+            passWrite.write(account['pass'])
+    return accounts
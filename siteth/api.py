@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+
+from siteth.cli import build_parser, normalize, dispatch
+
+# In-process entry points. Options use the CLI flag names, for example build(size=4, private=True, istanbul=True)
+
+
+def options(**values):
+    args = build_parser().parse_args([])
+    for key, value in values.items():
+        if not hasattr(args, key):
+            raise TypeError("unknown option {}".format(key))
+        setattr(args, key, value)
+    return normalize(args)
+
+
+def execute(**values):
+    args = options(**values)
+    dispatch(args)
+    return args
+
+
+def build(workspace='workspace', **values):
+    return execute(build=True, workspace=workspace, **values)
+
+
+def run(workspace='workspace', **values):
+    return execute(run=True, workspace=workspace, **values)
+
+
+def stop(workspace='workspace', **values):
+    return execute(stop=True, workspace=workspace, **values)
+
+
+def reset(workspace='workspace', **values):
+    return execute(reset=True, workspace=workspace, **values)
+
+
+def restart_privacy(workspace='workspace', **values):
+    return execute(restartPrivacy=True, workspace=workspace, **values)
+
+
+def export(path, workspace='workspace', **values):
+    return execute(export=path, workspace=workspace, **values)
+
+
+def import_archive(path, workspace='workspace', **values):
+    return execute(importArchive=path, workspace=workspace, **values)
+
+
+def deploy(contract, workspace='workspace', **values):
+    return execute(contract=contract, workspace=workspace, **values)
+
+
+def sender_port(args, sender):
+    from siteth.topology import load_topology
+    return load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart).node(sender).rpc
+
+
+def transactions_of(account, workspace='workspace', sender=1, from_block=0, to_block=None, **values):
+    # Returns the matching transactions as dicts, answered from net-info/index.sqlite
+    from siteth.index import query_index
+    args = options(workspace=workspace, **values)
+    return [json.loads(o) for o in query_index(os.path.abspath(workspace), sender_port(args, sender), account,
+                                               False, from_block, to_block, args.scanBatch, args.scanInflight)]
+
+
+def contracts_of(account, workspace='workspace', sender=1, from_block=0, to_block=None, **values):
+    from siteth.index import query_index
+    args = options(workspace=workspace, **values)
+    return [json.loads(o) for o in query_index(os.path.abspath(workspace), sender_port(args, sender), account,
+                                               True, from_block, to_block, args.scanBatch, args.scanInflight)]
+
+
+def get_contracts(workspace='workspace', sender=1, **values):
+    # Returns {account: [contract]} for every account in accounts.json
+    from siteth.index import discover_contracts
+    args = options(workspace=workspace, **values)
+    with open(os.path.join(os.path.abspath(workspace), 'net-info', 'accounts.json'), 'r') as reader:
+        accounts = json.load(reader)
+    return discover_contracts(os.path.abspath(workspace), sender_port(args, sender), accounts,
+                              not args.noIndex, args.scanBatch, args.scanInflight)
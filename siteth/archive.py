@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import sys
+import json
+import gzip
+import time
+import shutil
+import tarfile
+import hashlib
+import logging
+from collections import Counter
+
+from siteth.cache import file_digest
+from siteth.genesis import init_genesis
+from siteth.snapshot import SNAPSHOT_PATHS, clone_file, restore_snapshot
+from siteth.topology import load_topology, shift_ports, write_topology, busy_ports
+
+# Workspace archive: a tar.gz stream of manifest.json ({path: [sha256, size, mode]}, directories, source workspace)
+# followed by objects/<sha256>, files with the same content (keystores, static-nodes.json ...) are stored once
+ARCHIVE_VERSION = 1
+# Host or session state, never exported
+ARCHIVE_SKIP = (os.path.join('net-info', 'traffic'), os.path.join('net-info', 'monitor'),
+                os.path.join('net-info', 'processes.json'), os.path.join('net-info', 'placement.json'),
+                os.path.join('net-info', 'supervisor.sock'), os.path.join('net-info', 'supervisor.log'))
+ARCHIVE_SKIP_NAMES = ('LOCK', 'tm.ipc', 'geth.ipc', 'node.log', 'tessera.log')
+
+
+def chain_path(path):
+    # Chain state: node databases, Tessera stores, the index & snapshots other than genesis
+    parts = path.split(os.sep)
+    if parts[0].startswith('node-') and len(parts) > 1 and parts[1] in SNAPSHOT_PATHS:
+        return True
+    if parts[0] == 'net-info' and len(parts) > 1 and parts[1] == 'index.sqlite':
+        return True
+    if parts[0] == 'net-info' and len(parts) > 2 and parts[1] == 'snapshots' and parts[2] != 'genesis':
+        return True
+    return parts[-1].startswith('tessera-store-')
+
+
+def skipped(path, chain):
+    name = os.path.basename(path)
+    if path in ARCHIVE_SKIP or name in ARCHIVE_SKIP_NAMES or name.startswith(('node.log.', 'tessera.log.')):
+        return True
+    return not chain and chain_path(path)
+
+
+def workspace_manifest(workspace, chain=False):
+    # First pass, digest of every exported file
+    files = {}
+    dirs = []
+    for root, names, members in os.walk(workspace):
+        relative = os.path.relpath(root, workspace)
+        names[:] = sorted([o for o in names if not skipped(os.path.normpath(os.path.join(relative, o)), chain)])
+        dirs.extend([os.path.normpath(os.path.join(relative, o)) for o in names])
+        for name in sorted(members):
+            path = os.path.normpath(os.path.join(relative, name))
+            source = os.path.join(root, name)
+            if skipped(path, chain) or os.path.islink(source) or not os.path.isfile(source):
+                continue
+            files[path] = [file_digest(source), os.path.getsize(source), os.stat(source).st_mode & 0o777]
+    return {'version': ARCHIVE_VERSION, 'workspace': workspace, 'chain': chain, 'created': time.time(),
+            'dirs': dirs, 'files': files}
+
+
+def add_member(archive, name, reader, size, mode=0o644):
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = mode
+    info.mtime = int(time.time())
+    archive.addfile(info, reader)
+
+
+class DigestReader(object):
+    # File reader hashing what tarfile pulls, so a file modified since the manifest was taken is detected
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.reader.read(size)
+        self.digest.update(data)
+        return data
+
+
+def export_workspace(workspace, target, chain=False, level=6):
+    # Stream the workspace to target (a path or '-' for stdout). Without chain the nodes restart from genesis
+    started = time.time()
+    manifest = workspace_manifest(workspace, chain)
+    objects = {}
+    for path, (digest, size, mode) in sorted(manifest['files'].items()):
+        objects.setdefault(digest, path)
+
+    output = sys.stdout.buffer if target == '-' else open(target + '.tmp', 'wb')
+    try:
+        with gzip.GzipFile(fileobj=output, mode='wb', compresslevel=level) as compressed, \
+                tarfile.open(fileobj=compressed, mode='w|') as archive:
+            data = json.dumps(manifest).encode('utf-8')
+            add_member(archive, 'manifest.json', io.BytesIO(data), len(data))
+            for digest, path in objects.items():
+                with open(os.path.join(workspace, path), 'rb') as reader:
+                    checked = DigestReader(reader)
+                    add_member(archive, 'objects/{}'.format(digest), checked, manifest['files'][path][1])
+                if checked.digest.hexdigest() != digest:
+                    raise RuntimeError("{} changed during the export, stop the network first".format(path))
+    finally:
+        if target != '-':
+            output.close()
+    if target != '-':
+        os.replace(target + '.tmp', target)
+
+    total = sum([size for digest, size, mode in manifest['files'].values()])
+    stored = sum([manifest['files'][path][1] for path in objects.values()])
+    logging.info("Exported {} files ({:.1f}MB) as {} objects ({:.1f}MB) in {:.2f}s{}".format(
+        len(manifest['files']), total / 1024 / 1024, len(objects), stored / 1024 / 1024, time.time() - started,
+        '' if chain else ', chain state left out'))
+
+
+def rewrite_paths(value, old, new):
+    # Absolute paths embedded in JSON values (jdbc url, unix:.../tm.ipc, key paths)
+    if isinstance(value, dict):
+        return {k: rewrite_paths(v, old, new) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rewrite_paths(o, old, new) for o in value]
+    if isinstance(value, str):
+        return value.replace(old, new)
+    return value
+
+
+def write_json(path, value):
+    with open(path + '.tmp', 'w') as writer:
+        json.dump(value, writer)
+    os.replace(path + '.tmp', path)
+
+
+def rewrite_tessera_configs(topology, old, new):
+    # Move Tessera paths to the new workspace and its ports to the topology ones
+    peers = [{'url': 'http://localhost:{}'.format(o.tessera_p2p)} for o in topology]
+    for node in topology:
+        if not node.tessera:
+            continue
+        path = os.path.join(topology.tessera_dir(node.node), 'tessera-config.json')
+        with open(path, 'r') as reader:
+            config = rewrite_paths(json.load(reader), old, new)
+        for server in config['serverConfigs']:
+            if server['app'] in ('ThirdParty', 'P2P'):
+                server['serverAddress'] = 'http://localhost:{}'.format(
+                    node.tessera_thirdparty if server['app'] == 'ThirdParty' else node.tessera_p2p)
+        config['peer'] = peers
+        write_json(path, config)
+    if topology.private:
+        write_json(os.path.join(topology.workspace, 'net-info', 'tessera', 'endpoints.json'),
+                   ['http://localhost:{}/application.wadl'.format(o.tessera_thirdparty) for o in topology])
+
+
+def rewrite_static_nodes(topology):
+    # static-nodes.json & permissioned-nodes.json from the topology, raft nodes list the whole cluster
+    workspace = topology.workspace
+    staticNodes = topology.static_nodes()
+    write_json(os.path.join(workspace, 'net-info', 'static-nodes.json'), staticNodes)
+    if os.path.exists(os.path.join(workspace, 'net-info', 'istanbul', 'static-nodes.json')):
+        write_json(os.path.join(workspace, 'net-info', 'istanbul', 'static-nodes.json'), staticNodes)
+    permissioned = os.path.exists(os.path.join(workspace, 'net-info', 'permissioned-nodes.json'))
+    if permissioned:
+        write_json(os.path.join(workspace, 'net-info', 'permissioned-nodes.json'),
+                   [o.split('?')[0] for o in staticNodes])
+    for node in topology:
+        write_json(os.path.join(topology.datadir(node.node), 'static-nodes.json'),
+                   staticNodes if topology.consensus == 'raft' else topology.static_nodes(node.node))
+        if permissioned:
+            write_json(os.path.join(topology.datadir(node.node), 'permissioned-nodes.json'),
+                       [o.split('?')[0] for o in staticNodes])
+
+
+def read_objects(archive, manifest, partial):
+    # Second part of the stream: write each object to its first path, clone it to the others
+    paths = {}
+    for path, (digest, size, mode) in sorted(manifest['files'].items()):
+        paths.setdefault(digest, []).append(path)
+    methods = set(['reflink', 'hardlink'])
+    used = Counter()
+    # next() rather than iteration, iterating a stream restarts from the members already read (manifest.json)
+    member = archive.next()
+    while member is not None:
+        digest = member.name.rpartition('/')[2]
+        if not member.isfile() or member.name != 'objects/{}'.format(digest) or digest not in paths:
+            raise RuntimeError("Unexpected archive member {}".format(member.name))
+        first = os.path.join(partial, paths[digest][0])
+        os.makedirs(os.path.dirname(first), exist_ok=True)
+        checked = DigestReader(archive.extractfile(member))
+        with open(first, 'wb') as writer:
+            shutil.copyfileobj(checked, writer, 1 << 20)
+        if checked.digest.hexdigest() != digest:
+            raise RuntimeError("Checksum mismatch for {}, the archive is corrupted".format(paths[digest][0]))
+        for path in paths.pop(digest):
+            target = os.path.join(partial, path)
+            if target != first:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                used[clone_file(first, target, methods)] += 1
+            os.chmod(target, manifest['files'][path][2])
+        member = archive.next()
+    if paths:
+        raise RuntimeError("Archive is truncated, {} objects are missing".format(len(paths)))
+    return used
+
+
+def check_manifest(manifest, partial, port_offset):
+    # Runs before anything is written: every path must stay inside the staging directory
+    for path in list(manifest['files']) + manifest['dirs']:
+        target = os.path.normpath(os.path.join(partial, path))
+        if os.path.isabs(path) or '..' in path.replace('\\', '/').split('/') or \
+                not target.startswith(partial + os.sep):
+            raise RuntimeError("Archive path {} points outside the workspace".format(path))
+    # raft WAL & snapshots record the peer ports, the cluster would dial the original network
+    raft = [o for o in manifest['files'] if o.split(os.sep)[1:2] in (['raft-wal'], ['raft-snap'])]
+    if port_offset and raft:
+        raise RuntimeError("--importPortOffset can't move a raft network exported with its chain, "
+                           "the raft log keeps the original ports")
+
+
+def read_archive(source, partial, port_offset):
+    stream = sys.stdin.buffer if source == '-' else open(source, 'rb')
+    try:
+        with tarfile.open(fileobj=stream, mode='r|gz') as archive:
+            member = archive.next()
+            if member is None or member.name != 'manifest.json':
+                raise RuntimeError("{} is not a siteth workspace archive".format(source))
+            manifest = json.loads(archive.extractfile(member).read().decode('utf-8'))
+            if manifest.get('version') != ARCHIVE_VERSION:
+                raise RuntimeError("Archive version {} is not supported".format(manifest.get('version')))
+            check_manifest(manifest, partial, port_offset)
+            for path in manifest['dirs']:
+                os.makedirs(os.path.join(partial, path), exist_ok=True)
+            return manifest, read_objects(archive, manifest, partial)
+    except (tarfile.TarError, EOFError, OSError) as e:
+        raise RuntimeError("Could not read archive {}: {}".format(source, e))
+    finally:
+        if source != '-':
+            stream.close()
+
+
+def import_workspace(source, workspace, port_offset=0, workers=None):
+    # Rebuild a workspace from an archive (a path or '-' for stdin) written by export_workspace
+    if os.path.exists(workspace) and os.listdir(workspace):
+        raise RuntimeError("Workspace {} already exists, import into a new workspace".format(workspace))
+    started = time.time()
+    partial = workspace.rstrip(os.sep) + '.import'
+    shutil.rmtree(partial, ignore_errors=True)
+
+    try:
+        manifest, used = read_archive(source, partial, port_offset)
+        topology = load_topology(partial)
+
+        # nodes start from the genesis snapshot when the chain was left out, workspaces built without one need geth init
+        if not manifest['chain'] and os.path.exists(os.path.join(partial, 'net-info', 'snapshots', 'genesis')):
+            restore_snapshot(partial, 'genesis')
+        elif not manifest['chain']:
+            logging.info("No genesis snapshot in the archive, initialising the chain from genesis.json")
+            init_genesis(partial, topology.indexes(), workers)
+
+        if port_offset:
+            topology = shift_ports(topology, port_offset)
+            write_topology(topology)
+            rewrite_static_nodes(topology)
+            logging.info("Ports moved by {}".format(port_offset))
+        rewrite_tessera_configs(topology, manifest['workspace'], workspace)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+
+    if os.path.exists(workspace):
+        os.rmdir(workspace)
+    os.replace(partial, workspace)
+    busy = busy_ports([port for port, node, role in topology.ports()])
+    if busy:
+        logging.warning("Ports {} are in use on this host, import again with a port offset".format(
+            ', '.join([str(o) for o in busy])))
+    logging.info("Imported {} files in {:.2f}s ({})".format(
+        len(manifest['files']), time.time() - started,
+        ', '.join(['{} {}'.format(v, k) for k, v in sorted(used.items())]) or 'no duplicates'))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+
+# Build artifact cache. Files are stored once under objects/<sha256>, entries/<key>.json maps workspace paths to them
+CACHE = os.path.join(os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'siteth')
+
+
+def artifact_key(component, **params):
+    params['component'] = component
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as reader:
+        for chunk in iter(lambda: reader.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_restore(workspace, key):
+    # Copy a cached entry into the workspace, False when missing or damaged so the caller regenerates
+    entry = os.path.join(CACHE, 'entries', '{}.json'.format(key))
+    if not os.path.exists(entry):
+        return False
+    with open(entry, 'r') as reader:
+        files = json.load(reader)
+
+    # Verify every object before the workspace is touched, a partial restore would leave stale keys behind
+    for digest in set([digest for digest, mode in files.values()]):
+        stored = os.path.join(CACHE, 'objects', digest)
+        if not os.path.exists(stored):
+            logging.warning("Cache entry {} is missing objects, dropping it".format(key[:12]))
+            os.remove(entry)
+            return False
+        if file_digest(stored) != digest:
+            logging.warning("Cache object {} is corrupted, dropping entry {}".format(digest[:12], key[:12]))
+            os.remove(entry)
+            return False
+
+    copied = []
+    for path, (digest, mode) in files.items():
+        target = os.path.join(workspace, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(CACHE, 'objects', digest), target)
+        copied.append(target)
+        os.chmod(target, mode)
+        if file_digest(target) != digest:
+            logging.warning("Cache object {} changed while restoring, dropping entry {}".format(digest[:12], key[:12]))
+            for o in copied:
+                os.remove(o)
+            os.remove(entry)
+            return False
+
+    # Entry mtime is the LRU clock
+    os.utime(entry)
+    return True
+
+
+def cache_store(workspace, key, paths, limit):
+    # Store files and directories (relative to the workspace) under key then evict down to limit bytes.
+    # Objects are unencrypted keys & passwords, only the user can read the cache
+    for path in (CACHE, os.path.join(CACHE, 'objects'), os.path.join(CACHE, 'entries')):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        os.chmod(path, 0o700)
+
+    files = {}
+    for path in paths:
+        source = os.path.join(workspace, path)
+        if os.path.isdir(source):
+            members = [os.path.join(root, name) for root, dirs, names in os.walk(source) for name in names]
+        else:
+            members = [source]
+        for member in members:
+            digest = file_digest(member)
+            stored = os.path.join(CACHE, 'objects', digest)
+            if not os.path.exists(stored):
+                shutil.copyfile(member, stored + '.tmp')
+                os.chmod(stored + '.tmp', 0o600)
+                os.replace(stored + '.tmp', stored)
+            files[os.path.relpath(member, workspace)] = [digest, os.stat(member).st_mode & 0o777]
+
+    entry = os.path.join(CACHE, 'entries', '{}.json'.format(key))
+    with open(entry + '.tmp', 'w') as writer:
+        json.dump(files, writer)
+    os.replace(entry + '.tmp', entry)
+    cache_evict(limit)
+
+
+def cache_evict(limit):
+    # Keep the most recently used entries that fit in limit bytes, then drop unreferenced objects
+    entries = os.path.join(CACHE, 'entries')
+    objects = os.path.join(CACHE, 'objects')
+    ordered = sorted([os.path.join(entries, o) for o in os.listdir(entries) if o.endswith('.json')],
+                     key=os.path.getmtime, reverse=True)
+
+    kept = set()
+    total = 0
+    for entry in ordered:
+        with open(entry, 'r') as reader:
+            digests = set([digest for digest, mode in json.load(reader).values()]) - kept
+        size = sum([os.path.getsize(os.path.join(objects, o)) for o in digests
+                    if os.path.exists(os.path.join(objects, o))])
+        if kept and total + size > limit:
+            logging.info("Evicting cache entry {}".format(os.path.basename(entry)[:12]))
+            os.remove(entry)
+            continue
+        kept.update(digests)
+        total = total + size
+
+    for digest in os.listdir(objects):
+        if digest not in kept:
+            os.remove(os.path.join(objects, digest))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import logging
+import argparse
+import importlib
+
+# (selected, module, function) in execution order, modules under siteth.commands are only imported when selected
+COMMANDS = (
+    (lambda args: args.build and args.raft, 'build', 'build_raft'),
+    (lambda args: args.importArchive, 'archive', 'import_archive'),
+    (lambda args: args.sniffClear, 'sniff', 'clear'),
+    (lambda args: args.stop, 'stop', 'execute'),
+    (lambda args: args.snapshot, 'snapshot', 'take'),
+    (lambda args: args.restore, 'snapshot', 'restore'),
+    (lambda args: args.export, 'archive', 'export'),
+    (lambda args: args.restartPrivacy, 'privacy', 'execute'),
+    (lambda args: args.buildRaft, 'raft', 'execute'),
+    (lambda args: args.run, 'run', 'execute'),
+    (lambda args: args.container, 'container', 'execute'),
+    (lambda args: args.info, 'info', 'execute'),
+    (lambda args: args.logs, 'logs', 'execute'),
+    (lambda args: args.contract, 'contract', 'execute'),
+    (lambda args: args.getContracts, 'query', 'get_contracts'),
+    (lambda args: args.contractsOf, 'query', 'contracts_of'),
+    (lambda args: args.transactionsOf, 'query', 'transactions_of'),
+    (lambda args: args.load, 'load', 'execute'),
+    (lambda args: args.monitor, 'monitor', 'execute'),
+    (lambda args: args.reset and not args.build, 'reset', 'execute'),
+    (lambda args: args.sniffStop, 'sniff', 'stop'),
+    (lambda args: args.sniff, 'sniff', 'start'),
+    (lambda args: args.sniffSplit, 'sniff', 'split'),
+    (lambda args: args.trafficStats, 'traffic', 'execute'),
+    (lambda args: args.build and args.istanbul, 'build', 'build_istanbul'),
+    (lambda args: args.private and args.build, 'build', 'build_private'),
+)
+
+
+def command(module, function):
+    return getattr(importlib.import_module('siteth.commands.{}'.format(module)), function)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Quorum Network Maker')
+
+    parser.add_argument('--stop', action='store_true', help="Stop Existing Network")
+    parser.add_argument('--raft', action='store_true', default=True, help="Bootstrap raft network")
+    parser.add_argument('--istanbul', action='store_true', default=False, help="Bootstrap istanbul network")
+    parser.add_argument('--run', action='store_true', help="Run Existing Network")
+    parser.add_argument('--buildRaft', action='store_true', help="Build raft network")
+    parser.add_argument('--restartPrivacy', action='store_true', help="Restart Tessera Network")
+    parser.add_argument('--skipGeth', type=str, help="skip running geth instead print formed command. Use comma separation for multiple nodes(ex, 1,2,3,4)  or '*' for all nodes")
+    parser.add_argument('--debug', type=str, help="Rung golang binary Debug for specified nodes. Use comma separation for multiple nodes(ex, 1,2,3,4)  or '*' for all nodes")
+    parser.add_argument('--sniff', action='store_true', help="Sniff network traffic")
+    parser.add_argument('--sniffClear', action='store_true', help="Clearn sniffing data")
+    parser.add_argument('--sniffName', type=str, default='', help="Sniff session name. Time format if not set")
+    parser.add_argument('--sniffStop', action='store_true', help="Stop traffic sniffing")
+    parser.add_argument('--sniffSplit', action='store_true', help="Split a sniff session capture into per node geth.pcap & tessera.pcap. Latest session if --sniffName is not set")
+    parser.add_argument('--sniffFileSize', type=int, default=100, help="Size in MB of each capture ring buffer file")
+    parser.add_argument('--sniffFiles', type=int, default=10, help="Number of capture ring buffer files kept, older ones are overwritten")
+    parser.add_argument('--trafficStats', action='store_true', help="Per node, role & direction packet/byte counts of a sniff session (--sniffName, latest if not set) from an index saved next to the capture")
+    parser.add_argument('--trafficNode', type=int, help="Only count traffic of this node for --trafficStats")
+    parser.add_argument('--trafficPort', type=int, help="Only count traffic of the node role listening on this port for --trafficStats")
+    parser.add_argument('--trafficFrom', type=float, help="Start of the --trafficStats window, seconds since the first captured packet")
+    parser.add_argument('--trafficTo', type=float, help="End of the --trafficStats window, seconds since the first captured packet")
+    parser.add_argument('--trafficOut', type=str, help="Write the packets matched by --trafficStats to this pcap file")
+    parser.add_argument('--reset', action='store_true', help="Reset chain information")
+    parser.add_argument('--snapshot', type=str, help="Save chain, raft & Tessera state of the stopped network under net-info/snapshots/SNAPSHOT")
+    parser.add_argument('--restore', type=str, help="Restore a snapshot taken with --snapshot (or 'genesis') into the stopped network")
+    parser.add_argument('--export', type=str, help="Write the stopped workspace to a deduplicated tar.gz archive ('-' for stdout)")
+    parser.add_argument('--exportChain', action='store_true', help="Include chain, raft & Tessera state in --export, nodes restart from genesis otherwise")
+    parser.add_argument('--import', type=str, dest='importArchive', help="Create the workspace from an --export archive ('-' for stdin)")
+    parser.add_argument('--importPortOffset', type=int, default=0, help="Move every port of the imported network by this offset (ex, 1000)")
+    parser.add_argument('--getContracts', action='store_true', help="Get Information about all the contracts in the network")
+    parser.add_argument('--container', action='store_true', help="Build Docker container based infrastructure. NOT IMPLEMENTED YET")
+    parser.add_argument('--containerServer', type=str, default='unix://var/run/docker.sock', help="Docker server location")
+    parser.add_argument('--contract', type=str, help='Path to contract to deploy. This is contract.sol file')
+    parser.add_argument('--contractName', type=str, help='Contract to deploy when the --contract file defines several. Default to the one named after the file, else the last one')
+    parser.add_argument('--account', type=str, help='An existing ethereum account address to use to deploy contract from. if not set a random one will be picked')
+    parser.add_argument('--password', type=str, help='An existing ethereum account password')
+    parser.add_argument('--sender', type=str, help='The node index to use as sender of the transaction. if not set a random one will be picked')
+    parser.add_argument('--contractsOf', type=str, help='Show all contract creation transaction of account')
+    parser.add_argument('--transactionsOf', type=str, help='Show Accounts Transactions')
+    parser.add_argument('--fromBlock', type=int, default=0, help='First block to scan for --transactionsOf / --contractsOf')
+    parser.add_argument('--toBlock', type=int, help='Last block to scan for --transactionsOf / --contractsOf. Default to chain head')
+    parser.add_argument('--scanBatch', type=int, default=100, help='Blocks fetched per batched JSON-RPC request while scanning')
+    parser.add_argument('--scanInflight', type=int, default=4, help='Batched JSON-RPC requests kept in flight while scanning')
+    parser.add_argument('--noIndex', action='store_true', help='Scan the chain directly instead of syncing and querying net-info/index.sqlite')
+    parser.add_argument('--privateFor', type=str, help='Nodes index to use (ex. 1,2,3,4). will set privateFor to its the geth tx manager addresses for each node')
+    parser.add_argument('--load', action='store_true', help="Drive transactions through the running network and report TPS & latency under net-info/load")
+    parser.add_argument('--loadRate', type=float, default=50, help="Target transactions per second for --load")
+    parser.add_argument('--loadDuration', type=int, default=30, help="Seconds to submit transactions for --load")
+    parser.add_argument('--loadMix', type=str, default='transfer:60,call:30,private:10', help="Weighted transaction mix for --load, kinds: transfer, call, private")
+    parser.add_argument('--monitor', action='store_true', help="Sample every node height, peers, txpool, consensus role & CPU/RSS into net-info/monitor and show them live")
+    parser.add_argument('--monitorInterval', type=float, default=1.0, help="Seconds between --monitor samples")
+    parser.add_argument('--monitorCount', type=int, default=0, help="Stop --monitor after this many samples, 0 runs until Ctrl-C")
+    parser.add_argument('--info', action='store_true', help="Print information information")
+    parser.add_argument('--build', action='store_true', help="Build Network")
+    parser.add_argument('--private', action='store_true', help="Build With Privacy feature enabled")
+    parser.add_argument('--permissioned', action='store_true', help="Build With Permission feature nabled")
+    parser.add_argument('--size', type=int, default=7, help="Network size")
+    parser.add_argument('--topology', type=str, default='mesh', choices=['mesh', 'ring', 'kregular', 'hub'], help="istanbul p2p peering graph written to each node static-nodes.json. raft always builds a full mesh")
+    parser.add_argument('--topologyDegree', type=int, default=4, help="Peers of every node for --topology kregular")
+    parser.add_argument('--topologyHubs', type=int, default=1, help="Number of hub nodes for --topology hub, every other node peers with all hubs")
+    parser.add_argument('--topologySeed', type=int, help="Random seed of --topology kregular, random if not set")
+    parser.add_argument('--accounts', type=int, default=8, help="Total number of Accounts")
+    parser.add_argument('--buildWorkers', type=int, default=os.cpu_count(), help="Number of parallel workers used while building. Default to number of cores")
+    parser.add_argument('--keystoreMode', type=str, default='hardlink', choices=['hardlink', 'shared', 'copy'], help="How nodes get the accounts keystore. hardlink: link files into node-N/keystore (copy fallback), shared: all nodes use net-info/keystore, copy: full copy per node")
+    parser.add_argument('--lightKdf', action='store_true', help="Generate account keys with light KDF. Faster but weaker, use for throwaway networks only")
+    parser.add_argument('--cache', action='store_true', help="Reuse accounts, node keys and Tessera keys from the local build cache ($XDG_CACHE_HOME/siteth) when the build parameters match")
+    parser.add_argument('--cacheSeed', type=str, default='default', help="Cache seed, change it to build fresh key material with the same parameters")
+    parser.add_argument('--cacheLimit', type=int, default=256, help="Build cache size limit in MB, least recently used entries are evicted")
+    parser.add_argument('--workspace', type=str, default='workspace', help="Network workspace folder")
+    parser.add_argument('--ether', type=int, default=1000000000000000000000000000, help="Initial Account Funding Value")
+    parser.add_argument('--raftStartPort', type=int, default=50400, help="Raft Start Port")
+    parser.add_argument('--gethStartPort', type=int, default=21000, help="Geth peering Start Port")
+    parser.add_argument('--rpcStartPort', type=int, default=22000, help="RPC Start Port")
+    parser.add_argument('--txTpStartPort', type=int, default=9080, help="Tessera Third Party Start Port")
+    parser.add_argument('--tesserDebugPortStart', type=int, default=6900, help="Tessera Debug port start")
+    parser.add_argument('--txQtStartPort', type=int, default=22000, help="Tessera Quorum Transaction Start Port")
+    parser.add_argument('--txPpStartPort', type=int, default=9000, help="Tessera Peer Network Start Port")
+    parser.add_argument('--unlockCount', type=int, default=1, help="Number of random accounts to unlock in each node on --run")
+    parser.add_argument('--unlockDuration', type=int, default=0, help="Seconds accounts stay unlocked. 0 keeps them unlocked until geth exits")
+    parser.add_argument('--gethTimeout', type=int, default=60, help="Seconds to wait for geth IPC/RPC endpoints to come up")
+    parser.add_argument('--tesseraTimeout', type=int, default=120, help="Seconds to wait for every Tessera node to become ready")
+    parser.add_argument('--istanbulStartPort', type=int, default=30300, help="Istanbul start port")
+    parser.add_argument('--gethParams', type=str, default="", help="Additional geth parameters")
+    parser.add_argument('--update', action="store_true", help="Update binaries")
+    parser.add_argument('--verbosity', type=int, default=5, help="geth log verbosity (0-5)")
+    parser.add_argument('--logSize', type=int, default=50, help="Size in MB after which node.log / tessera.log are rotated and compressed")
+    parser.add_argument('--logFiles', type=int, default=5, help="Number of compressed rotated logs kept per process")
+    parser.add_argument('--logs', action='store_true', help="Follow geth & Tessera logs of every node, interleaved by timestamp")
+    parser.add_argument('--logsNode', type=str, help="Only follow these nodes logs (ex, 1,2,3)")
+    parser.add_argument('--logsSource', type=str, default='all', choices=['all', 'geth', 'tessera'], help="Which logs --logs follows")
+    parser.add_argument('--logsGrep', type=str, help="Only print log lines matching this regular expression")
+    parser.add_argument('--logsLines', type=int, default=10, help="Lines of each log printed before following")
+    parser.add_argument('--logsNoFollow', action='store_true', help="Print the last --logsLines lines and exit")
+    parser.add_argument('--restartCrashed', action='store_true', help="Restart crashed geth/Tessera processes with backoff")
+    parser.add_argument('--stopTimeout', type=int, default=10, help="Seconds to wait after SIGTERM before killing a process")
+    parser.add_argument('--placement', type=str, choices=['auto', 'off'], help="Pin geth/Tessera processes to CPUs round robin on --run (auto) or drop the saved placement (off)")
+    parser.add_argument('--placementCpus', type=str, help="CPUs the placement may use (ex, 0-7,12). Defaults to the CPUs siteth can run on")
+    parser.add_argument('--placementNodes', type=str, help="Pin nodes geth & Tessera to CPU sets (ex, 1:0-1;2:2)")
+    parser.add_argument('--cpusPerProcess', type=int, default=1, help="CPUs given to each round robin placed process")
+    parser.add_argument('--memoryLimit', type=int, help="Memory limit in MB of each geth/Tessera process (cgroup v2, else prlimit for geth & -XX:MaxRAM for Tessera)")
+    parser.add_argument('--cpuLimit', type=float, help="CPU quota in cores of each geth/Tessera process (cgroup v2 only)")
+    parser.add_argument('--supervisor', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+
+def normalize(args):
+    if not args.skipGeth:
+        args.skipGeth = []
+    elif isinstance(args.skipGeth, str):
+        args.skipGeth = args.skipGeth.split(',')
+
+    if args.istanbul:
+        args.raft = False
+    return args
+
+
+def dispatch(args):
+    if args.update:
+        command('update', 'execute')(args)
+
+    if not args.build and not args.importArchive and not os.path.exists(os.path.abspath(args.workspace)):
+        logging.warning("Workspace can't be found".format(args.workspace))
+        return
+
+    if args.supervisor:
+        command('supervise', 'execute')(args)
+        return
+
+    for selected, module, function in COMMANDS:
+        if selected(args):
+            command(module, function)(args)
+
+
+def main(argv=None):
+    logging.basicConfig(format="%(levelname)s [%(asctime)s] %(message)s", level=logging.INFO)
+    args = normalize(build_parser().parse_args(argv))
+    try:
+        dispatch(args)
+    except RuntimeError as e:
+        logging.error(e)
+        sys.exit(1)
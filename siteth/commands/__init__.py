@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+# One module per CLI command, imported lazily by siteth.cli so a command only pays for its own dependencies
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+from siteth.archive import export_workspace, import_workspace
+from siteth.workspace import running_processes
+
+
+def export(args):
+    running = running_processes(os.path.abspath(args.workspace), ['geth-', 'tessera-'])
+    if running:
+        raise RuntimeError("Stop the network before exporting it, still running: {}".format(', '.join(running)))
+    logging.info("Exporting {} to {}".format(os.path.abspath(args.workspace), args.export))
+    export_workspace(os.path.abspath(args.workspace), args.export, args.exportChain)
+
+
+def import_archive(args):
+    logging.info("Importing {} into {}".format(args.importArchive, os.path.abspath(args.workspace)))
+    import_workspace(args.importArchive, os.path.abspath(args.workspace), args.importPortOffset, args.buildWorkers)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import random
+import string
+import shutil
+import logging
+import subprocess
+
+from siteth.config import RES, ISTANBUL, ISTANBUL_SETUP_NETWORK
+from siteth.accounts import generate_accounts
+from siteth.cache import artifact_key, cache_restore, cache_store
+from siteth.genesis import init_genesis
+from siteth.nodekey import generate_node_keys
+from siteth.snapshot import take_snapshot
+from siteth.tessera import generate_tessera_keys
+from siteth.topology import node_topology, add_tessera, add_peers, peer_graph, check_ports, write_topology, \
+    load_topology
+from siteth.workspace import share_keystore
+
+
+def cache_key(args, component):
+    return artifact_key(component, seed=args.cacheSeed, size=args.size, accounts=args.accounts, private=args.private,
+                        permissioned=args.permissioned, consensus='istanbul' if args.istanbul else 'raft',
+                        lightKdf=args.lightKdf)
+
+
+def cached(args, component):
+    # Restore key material from the build cache, port dependent files are always regenerated
+    if not args.cache or not cache_restore(os.path.abspath(args.workspace), cache_key(args, component)):
+        return False
+    logging.info("Restored {} from cache (seed: {})".format(component, args.cacheSeed))
+    return True
+
+
+def cache(args, component, paths):
+    if args.cache:
+        cache_store(os.path.abspath(args.workspace), cache_key(args, component), paths, args.cacheLimit * 1024 * 1024)
+
+
+def planned_topology(args, consensus, enodes):
+    topology = node_topology(os.path.abspath(args.workspace), consensus, enodes,
+                             args.istanbulStartPort if consensus == 'istanbul' else args.gethStartPort,
+                             args.raftStartPort, args.rpcStartPort)
+    if args.private:
+        topology = add_tessera(topology, args.txPpStartPort, args.txTpStartPort, args.tesserDebugPortStart)
+    # raft dials every cluster member over p2p whatever static-nodes.json lists, only istanbul can peer sparsely
+    graph = args.topology if consensus == 'istanbul' else 'mesh'
+    return add_peers(topology, peer_graph(graph, args.size, args.topologyDegree, args.topologyHubs, args.topologySeed))
+
+
+def build_accounts(args):
+    logging.info('Generating Accounts')
+    if cached(args, 'accounts'):
+        with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'accounts.json'), 'r') as reader:
+            return json.load(reader)
+
+    # Generate passwords
+    for account in range(1, args.accounts + 1):
+        with open(os.path.join(args.workspace, 'net-info', 'accounts', 'account-{}.pass'.format(account)),
+                  'w') as passFile:
+            passFile.write(''.join([random.choice(string.ascii_letters + string.digits) for n in range(32)]))
+
+    # Generate Accounts
+    accounts = generate_accounts(os.path.abspath(args.workspace), args.accounts, args.buildWorkers, args.lightKdf)
+    cache(args, 'accounts', [os.path.join('net-info', 'accounts.json'), os.path.join('net-info', 'accounts'),
+                             os.path.join('net-info', 'keystore')])
+    return accounts
+
+
+def build_raft(args):
+    # Fail before any key is generated when the start ports overlap or are taken
+    check_ports(planned_topology(args, 'raft', [None] * args.size))
+    if args.topology != 'mesh':
+        logging.warning("--topology {} only applies to istanbul, raft members connect to every other member. "
+                        "Building a full mesh".format(args.topology))
+    logging.info('Generating Workspace')
+    # Clean workspace if exists
+    if os.path.exists(args.workspace):
+        shutil.rmtree(args.workspace)
+
+    # Generate workspace folders tree
+    os.mkdir(args.workspace)
+    os.mkdir(os.path.join(args.workspace, 'net-info'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'tessera'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'traffic'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'helpers'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'accounts'))
+    [os.mkdir(os.path.join(args.workspace, 'node-{}'.format(o))) for o in range(1, args.size + 1)]
+
+    # 2 - Generate accounts
+    accounts = build_accounts(args)
+    # Share keystore
+    share_keystore(os.path.abspath(args.workspace), args.size, args.keystoreMode)
+
+    # Generate Genesis file
+    logging.info("Generate Genesis file")
+    genesis = {}
+    with open(os.path.join(RES, 'other', 'genesis.json')) as genesisFile:
+        genesis = json.load(genesisFile)
+        for o in accounts:
+            genesis['alloc'][o['account'].replace('0x', '')] = {"balance": '{}'.format(args.ether)}
+        with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'genesis.json'), 'w') as genWriter:
+            json.dump(genesis, genWriter)
+
+    # Generate Node Keys
+    logging.info("Generate Nodes Keys & Enodes")
+    if cached(args, 'nodekeys'):
+        enodes = []
+        for node in range(1, args.size + 1):
+            with open(os.path.join(os.path.abspath(args.workspace), 'node-{}'.format(node), 'enode'), 'r') as reader:
+                enodes.append(reader.read().strip())
+    else:
+        enodes = generate_node_keys(os.path.abspath(args.workspace), args.size)
+        cache(args, 'nodekeys', [os.path.join('node-{}'.format(o), name) for o in range(1, args.size + 1)
+                                 for name in ('nodekey', 'enode')])
+
+    logging.info("Generate topology.json & static-nodes.json")
+    topology = planned_topology(args, 'raft', enodes)
+    write_topology(topology)
+    staticNodes = topology.static_nodes()
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'static-nodes.json'), 'w') as staticWriter:
+        staticWriter.write(json.dumps(staticNodes))
+
+    # raft bootstraps its cluster from static-nodes.json, every node needs the full list including itself
+    for node in range(1, args.size + 1):
+        shutil.copy(os.path.join(os.path.abspath(args.workspace), 'net-info', 'static-nodes.json'),
+                    os.path.join(os.path.abspath(args.workspace), 'node-{}'.format(node), 'static-nodes.json'))
+
+    if args.permissioned:
+        logging.info("Generate permissioned-nodes.json")
+        with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'permissioned-nodes.json'),
+                  'w') as permissionWriter:
+
+            permissioned = [entry.split("?")[0] for entry in staticNodes]
+            permissionWriter.write(json.dumps(permissioned))
+
+        for node in range(1, args.size + 1):
+            logging.info("Generate permissioned entries for node-{}".format(node))
+            shutil.copy(os.path.join(os.path.abspath(args.workspace), 'net-info', 'permissioned-nodes.json'),
+                        os.path.join(os.path.abspath(args.workspace), 'node-{}'.format(node),
+                                     'permissioned-nodes.json'))
+
+    logging.info("Write genesis states")
+    init_genesis(os.path.abspath(args.workspace), range(1, args.size + 1), args.buildWorkers)
+    take_snapshot(os.path.abspath(args.workspace), 'genesis', range(1, args.size + 1))
+
+
+def build_istanbul(args):
+    check_ports(planned_topology(args, 'istanbul', [None] * args.size))
+    logging.info('Generating Workspace')
+    # Clean workspace if exists
+    if os.path.exists(args.workspace):
+        shutil.rmtree(args.workspace)
+
+    # Generate workspace folders tree
+    os.mkdir(args.workspace)
+    os.mkdir(os.path.join(args.workspace, 'net-info'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'tessera'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'istanbul'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'traffic'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'helpers'))
+    os.mkdir(os.path.join(args.workspace, 'net-info', 'accounts'))
+    [os.mkdir(os.path.join(args.workspace, 'node-{}'.format(o))) for o in range(1, args.size + 1)]
+
+    # 2 - Generate accounts
+    accounts = build_accounts(args)
+    # Share keystore
+    share_keystore(os.path.abspath(args.workspace), args.size, args.keystoreMode)
+
+    # Generate keys, genesis & static-nodes
+    logging.info("Generate genesis.json & static-nodes.json")
+    pwd = os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul')
+    if not cached(args, 'istanbul'):
+        exec_args = ISTANBUL_SETUP_NETWORK.format(args.size)
+        subprocess.run([ISTANBUL] + exec_args.split(' '), cwd=pwd)
+        cache(args, 'istanbul', [os.path.join('net-info', 'istanbul')])
+
+    # Genesis file
+    # Populate with generated accounts
+    genesis = {}
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', 'genesis.json')) as genesisFile:
+        genesis = json.load(genesisFile)
+        genesis['alloc'] = {}
+        for o in accounts:
+            genesis['alloc'][o['account'].replace('0x', '')] = {"balance": '{}'.format(args.ether)}
+
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'genesis.json'), 'w') as genWriter:
+        json.dump(genesis, genWriter)
+
+    # Process genesis file
+    logging.info("Setup genesis file")
+    init_genesis(os.path.abspath(args.workspace), range(1, args.size + 1), args.buildWorkers)
+    take_snapshot(os.path.abspath(args.workspace), 'genesis', range(1, args.size + 1))
+
+    logging.info("Setup Nodes Key")
+    for node in range(1, args.size + 1):
+        shutil.move(
+            os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', '{}'.format(node - 1), 'nodekey'),
+            os.path.join(os.path.abspath(args.workspace), 'node-{}'.format(node), 'nodekey')
+        )
+        shutil.rmtree(os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', '{}'.format(node - 1)))
+
+    logging.info("Setup Static Nodes")
+    istanbulStatic = []
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', 'static-nodes.json'),
+              'r') as reader:
+        istanbulStatic = json.load(reader)
+
+    # Fix static node port
+    topology = planned_topology(args, 'istanbul', [o.split('@')[0].replace('enode://', '') for o in istanbulStatic])
+    write_topology(topology)
+    istanbulStatic = topology.static_nodes()
+
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', 'static-nodes.json'),
+              'w') as writer:
+        json.dump(istanbulStatic, writer)
+
+    shutil.copy(os.path.join(os.path.abspath(args.workspace), 'net-info', 'istanbul', 'static-nodes.json'),
+                os.path.join(os.path.abspath(args.workspace), 'net-info', 'static-nodes.json'))
+
+    for node in topology:
+        nodepath = topology.datadir(node.node)
+        with open(os.path.join(nodepath, 'enode'), 'w') as writer:
+            writer.write(node.enode)
+        with open(os.path.join(nodepath, 'static-nodes.json'), 'w') as writer:
+            json.dump(topology.static_nodes(node.node), writer)
+    logging.info("{} peering: {} p2p connections".format(args.topology, topology.connections))
+
+    if args.permissioned:
+        logging.info("Generate permissioned-nodes.json")
+        with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'permissioned-nodes.json'),
+                  'w') as permissionWriter:
+
+            permissioned = [entry.split("?")[0] for entry in istanbulStatic]
+            permissionWriter.write(json.dumps(permissioned))
+
+        for node in range(1, args.size + 1):
+            logging.info("Generate permissioned entries for node-{}".format(node))
+            shutil.copy(os.path.join(os.path.abspath(args.workspace), 'net-info', 'permissioned-nodes.json'),
+                        os.path.join(os.path.abspath(args.workspace), 'node-{}'.format(node),
+                                     'permissioned-nodes.json'))
+
+
+def build_private(args):
+    if args.private:
+        logging.info("Generate Tessera Keys")
+        if not cached(args, 'tessera'):
+            for node in range(1, args.size + 1):
+                nodetx = os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera',
+                                      'node-{}-tx'.format(node))
+                os.makedirs(nodetx, exist_ok=True)
+                with open(os.path.join(nodetx, 'node-tx-keys.pass'), 'w') as passFile:
+                    passFile.write(''.join([random.choice(string.ascii_letters + string.digits) for n in range(32)]))
+            generate_tessera_keys(os.path.abspath(args.workspace), range(1, args.size + 1))
+            cache(args, 'tessera', [os.path.join('net-info', 'tessera', 'node-{}-tx'.format(o))
+                                    for o in range(1, args.size + 1)])
+
+        logging.info("Generate Tessera Config")
+        tesseraConfigTemplate = {}
+        with open(os.path.join(RES, 'other', 'tessera.json')) as genesisFile:
+            tesseraConfigTemplate = json.load(genesisFile)
+
+        topology = load_topology(os.path.abspath(args.workspace))
+        TesserConfigPeers = [{"url": "http://localhost:{}".format(o.tessera_p2p)} for o in topology]
+
+        tessera_endpoints = []
+        for node in topology.indexes():
+            txPpStartPort = topology.node(node).tessera_p2p
+            txTpStartPort = topology.node(node).tessera_thirdparty
+
+            tessera_endpoints.append("http://localhost:{}/application.wadl".format(txTpStartPort))
+            nodetx = topology.tessera_dir(node)
+            nodetxServerConfig = [
+                {
+                    "app": "ThirdParty",
+                    "enabled": True,
+                    "serverAddress": "http://localhost:{}".format(txTpStartPort),
+                    "communicationType": "REST"
+                },
+                {
+                    "app": "Q2T",
+                    "enabled": True,
+                    "serverAddress": "unix:{}/tm.ipc".format(nodetx),
+                    "communicationType": "REST"
+                },
+                {
+                    "app": "P2P",
+                    "enabled": True,
+                    "serverAddress": "http://localhost:{}".format(txPpStartPort),
+                    "sslConfig": {
+                        "tls": "OFF"
+                    },
+                    "communicationType": "REST"
+                }
+            ]
+            nodetxKeysConfig = [{
+                "privateKeyPath": "{}/node-tx-key.key".format(nodetx),
+                "publicKeyPath": "{}/node-tx-key.pub".format(nodetx)
+            }]
+
+            tesseraConfigTemplate["jdbc"][
+                "url"] = "jdbc:h2:/{}/tessera-store-{};MODE=Oracle;TRACE_LEVEL_SYSTEM_OUT=0".format(nodetx, node)
+            tesseraConfigTemplate["serverConfigs"] = nodetxServerConfig
+            tesseraConfigTemplate["peer"] = TesserConfigPeers
+            tesseraConfigTemplate["keys"]["keyData"] = nodetxKeysConfig
+
+            with open(os.path.join(nodetx, 'tessera-config.json'.format(node)), 'w') as tesseraConfigWriter:
+                json.dump(tesseraConfigTemplate, tesseraConfigWriter)
+
+        with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera', 'endpoints.json'),
+                  'w') as tesseraEndpointWriter:
+            json.dump(tessera_endpoints, tesseraEndpointWriter)
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+
+def execute(args):
+    logging.warning("This feature is not supported Yet")
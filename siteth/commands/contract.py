@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import random
+import logging
+
+from siteth.config import RES, GETH, GETH_EXECUTE_RPC
+from siteth.solc import compile_contract
+from siteth.topology import load_topology
+
+
+def execute(args):
+    privateForPubKeyList = []
+    privateForIndexList = []
+    network = os.path.join(os.path.abspath(args.workspace), 'net-info')
+    tessera = os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera')
+
+    logging.info("Deploy contract:{}".format(args.contract))
+    if not args.account:
+        logging.info("Deploy using random account")
+        with open(os.path.join(args.workspace, 'net-info', 'accounts.json'), 'r') as accountsReader:
+            accounts = json.load(accountsReader)
+            args.account = accounts[random.randint(0, len(accounts) - 1)]
+
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not args.sender:
+        logging.info("Deploy using random node")
+        args.sender = random.choice(topology.indexes())
+
+    if args.privateFor:
+        args.privateFor = args.privateFor.strip(' ')
+        if args.privateFor == '*':
+            privateForIndexList = topology.indexes()
+        elif ',' in args.privateFor:
+            privateForIndexList = [o for o in args.privateFor.split(',') if o != '']
+        else:
+            privateForIndexList.append(args.privateFor)
+
+        for tx in privateForIndexList:
+            if not topology.tessera_dir(tx):
+                raise RuntimeError("node-{} has no Tessera node, build the workspace with --private".format(tx))
+            with open(os.path.join(topology.tessera_dir(tx), 'node-tx-key.pub'), 'r') as keyReader:
+                privateForPubKeyList.append(keyReader.read())
+
+    contractName, contractABI, contractByteCode = compile_contract(os.path.abspath(args.workspace),
+                                                                   args.contract, args.contractName)
+    logging.info("Deploying contract {}".format(contractName))
+
+    # Generate template
+    contractTemplate = ''
+
+    if privateForPubKeyList:
+        logging.info("Deploy contract as private contract from node:node-{} to nodes:{} using account:{}".format(
+            args.sender,
+            privateForIndexList,
+            args.account['account']
+        ))
+
+        with open(os.path.join(RES, 'helpers', 'private-contract-build.js'), 'r') as reader:
+            contractTemplate = reader.read()
+
+        contractTemplate = contractTemplate.replace('*abi*', contractABI)
+        contractTemplate = contractTemplate.replace('*abi*', contractABI)
+        contractTemplate = contractTemplate.replace('*bytecode*', contractByteCode)
+        contractTemplate = contractTemplate.replace('*account*', args.account['account'])
+        contractTemplate = contractTemplate.replace('*password*', args.account['pass'])
+        contractTemplate = contractTemplate.replace('*privateFor*', json.dumps(privateForPubKeyList))
+
+    else:
+        logging.info("Deploy contract as public contract from node:node-{} using account:{}".format(
+            args.sender,
+            args.account['account']
+        ))
+
+        with open(os.path.join(RES, 'helpers', 'public-contract-build.js'), 'r') as reader:
+            contractTemplate = reader.read()
+
+        contractTemplate = contractTemplate.replace('*abi*', contractABI)
+        contractTemplate = contractTemplate.replace('*bytecode*', contractByteCode)
+        contractTemplate = contractTemplate.replace('*account*', args.account['account'])
+        contractTemplate = contractTemplate.replace('*password*', args.account['pass'])
+
+    contractDeployFile = os.path.join(os.path.abspath(args.workspace), 'net-info', 'helpers', '{}_{}.js'.format(
+        re.sub(r'[:./\\]', '_', args.contract), contractName))
+    with open(contractDeployFile, 'w') as writer:
+        writer.write(contractTemplate)
+
+    os.popen(GETH_EXECUTE_RPC.format(
+        GETH,
+        topology.datadir(args.sender),
+        "loadScript('{}')".format(contractDeployFile)
+    )).read()
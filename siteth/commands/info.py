@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+
+from siteth.placement import describe_placement
+from siteth.snapshot import list_snapshots
+from siteth.topology import load_topology
+from siteth.workspace import read_processes, read_workspace_settings
+
+
+def execute(args):
+    print("+ Infrastructure:")
+    print("{}".format(os.path.abspath(args.workspace)))
+
+    network = os.path.join(os.path.abspath(args.workspace), 'net-info')
+    tessera = os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera')
+    # Processes
+    print("+ Processes:")
+    for name, process in sorted(read_processes(os.path.abspath(args.workspace)).items()):
+        print("{} pid:{} status:{} restarts:{} {}".format(name, process['pid'], process['status'], process['restarts'],
+                                                       describe_placement(process.get('placement'))))
+    # Keystore
+    print("+ Keystore mode:")
+    print(read_workspace_settings(os.path.abspath(args.workspace)).get('keystore', 'copy'))
+    # Snapshots
+    print("+ Snapshots:")
+    for name in list_snapshots(os.path.abspath(args.workspace)):
+        print(name)
+    # Accounts
+    print("+ Accounts:")
+    with open(os.path.join(args.workspace, 'net-info', 'accounts.json'), 'r') as accountsReader:
+        accounts = json.load(accountsReader)
+        for o in accounts:
+            print("{}:{}".format(o['account'], o['pass']))
+
+    # Quorum
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    print("+ Quorum endpoints:")
+    for node in topology:
+        print('{} rpc:http://127.0.0.1:{}'.format(topology.enode_url(node.node), node.rpc))
+    print("+ Peering:")
+    degrees = [len(o.peers) for o in topology]
+    print("{} p2p connections, {} to {} peers per node".format(topology.connections, min(degrees), max(degrees)))
+
+    # Tressera
+    if topology.private:
+        print("+ Transaction manager endpoint information:")
+        for node in topology:
+            print("http://localhost:{}/application.wadl".format(node.tessera_thirdparty))
+
+        print("+ Transaction manager endpoints:")
+        for node in topology:
+            with open(os.path.join(topology.tessera_dir(node.node), 'node-tx-key.pub'), 'r') as keyReader:
+                print('http://localhost:{} - {}'.format(node.tessera_p2p, keyReader.read()))
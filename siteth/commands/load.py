@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+import datetime
+
+from siteth.load import LoadGenerator, parse_mix
+from siteth.topology import load_topology
+
+
+def execute(args):
+    if args.loadRate <= 0:
+        raise RuntimeError("--loadRate must be a positive number of transactions per second, got {}".format(
+            args.loadRate))
+    workspace = os.path.abspath(args.workspace)
+    topology = load_topology(workspace, args.rpcStartPort, args.tesserDebugPortStart)
+    nodes = topology.indexes(args.skipGeth)
+    with open(os.path.join(workspace, 'net-info', 'accounts.json'), 'r') as reader:
+        accounts = json.load(reader)
+
+    tesseraKeys = {}
+    for node in nodes:
+        nodetx = topology.tessera_dir(node)
+        if nodetx and os.path.exists(os.path.join(nodetx, 'node-tx-key.pub')):
+            with open(os.path.join(nodetx, 'node-tx-key.pub'), 'r') as reader:
+                tesseraKeys[node] = reader.read().strip()
+
+    mix = parse_mix(args.loadMix)
+    if 'private' in mix and len(tesseraKeys) < len(nodes):
+        logging.warning("Workspace was not built with --private, dropping private transactions from the mix")
+        mix.pop('private')
+        mix = parse_mix(','.join(['{}:{}'.format(k, v) for k, v in mix.items()]))
+
+    consensus = topology.consensus
+    logging.info("Load {} tx/s for {}s over {} nodes ({}), mix {}".format(
+        args.loadRate, args.loadDuration, len(nodes), consensus,
+        ', '.join(['{}:{:.0%}'.format(k, v) for k, v in sorted(mix.items())])))
+
+    generator = LoadGenerator(topology.rpc_ports(nodes), accounts, tesseraKeys, args.gethTimeout)
+    generator.prepare()
+    result = generator.run(args.loadRate, args.loadDuration, mix)
+    result['consensus'] = consensus
+    result['private'] = bool(tesseraKeys)
+
+    os.makedirs(os.path.join(workspace, 'net-info', 'load'), exist_ok=True)
+    path = os.path.join(workspace, 'net-info', 'load', '{}-{}.json'.format(
+        consensus, datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")))
+    with open(path, 'w') as writer:
+        json.dump(result, writer, indent=2)
+
+    print("+ Load:")
+    print("submitted:{} included:{} errors:{} submit tps:{:.1f} tps:{:.1f}".format(
+        result['submitted'], result['included'], result['errors'], result['submit_tps'], result['tps']))
+    for kind, stats in sorted(result['kinds'].items()):
+        latency = stats['latency']
+        if not latency:
+            print("{} included:0 errors:{}".format(kind, stats['errors']))
+            continue
+        print("{} included:{} errors:{} latency ms p50:{:.0f} p90:{:.0f} p99:{:.0f} max:{:.0f}".format(
+            kind, stats['included'], stats['errors'], latency['p50'], latency['p90'], latency['p99'], latency['max']))
+        if 'tessera' in stats:
+            print("{} tessera p50:{:.0f}ms share:{:.0%}".format(kind, stats['tessera']['p50'],
+                                                              stats['tessera']['share']))
+    print("+ Results:")
+    print(path)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+from siteth.logs import follow_logs
+from siteth.topology import load_topology
+
+
+def execute(args):
+    workspace = os.path.abspath(args.workspace)
+    topology = load_topology(workspace, args.rpcStartPort, args.tesserDebugPortStart)
+    nodes = topology.indexes()
+    if args.logsNode:
+        nodes = [int(o) for o in args.logsNode.replace(' ', '').split(',') if o != '']
+
+    files = []
+    for node in nodes:
+        if args.logsSource in ('all', 'geth'):
+            files.append(('geth-{}'.format(node), os.path.join(topology.datadir(node), 'node.log')))
+        tessera = topology.tessera_dir(node)
+        if args.logsSource in ('all', 'tessera') and tessera and os.path.exists(tessera):
+            files.append(('tessera-{}'.format(node), os.path.join(tessera, 'tessera.log')))
+
+    follow_logs(files, re.compile(args.logsGrep) if args.logsGrep else None, args.logsLines, not args.logsNoFollow)
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from siteth.monitor import Monitor
+from siteth.topology import load_topology
+
+
+def execute(args):
+    workspace = os.path.abspath(args.workspace)
+    topology = load_topology(workspace, args.rpcStartPort, args.tesserDebugPortStart)
+    monitor = Monitor(workspace, topology.rpc_ports(topology.indexes(args.skipGeth)), topology.consensus,
+                      topology.enode_ids(), args.gethTimeout)
+    path = monitor.run(args.monitorInterval, args.monitorCount)
+    print("+ Samples:")
+    print(path)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+from siteth.placement import read_placement
+from siteth.supervisor import stop_processes
+from siteth.tessera import start_tessera, wait_tessera
+from siteth.topology import load_topology
+
+
+def execute(args):
+    logging.info("Stopping privacy network")
+    stop_processes(os.path.abspath(args.workspace), ['tessera-'], args.stopTimeout)
+    logging.info("Restart privacy network")
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    debug_target = []
+    if args.debug:
+        if args.debug == '*':
+            debug_target = topology.indexes()
+        else:
+            debug_target = [int(o) for o in args.debug.replace(' ', '').split(",") if o != '']
+
+        logging.info("Debugging the following geth, tessera instances {}".format(debug_target))
+
+    private = True if args.private else True if len(
+        os.listdir(os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera'))) > 0 else False
+    if private:
+        logging.info("Run Tessera network")
+        # Tessera keeps the CPUs the last --run planned
+        start_tessera(os.path.abspath(args.workspace), topology, debug_target,
+                      args.restartCrashed, args.stopTimeout, args.logSize * 1024 * 1024, args.logFiles,
+                      read_placement(os.path.abspath(args.workspace)))
+        wait_tessera(os.path.abspath(args.workspace), len(topology), args.tesseraTimeout)
+        logging.info("Tessera infrastructure was successfully bootstrapped")
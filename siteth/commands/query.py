@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import random
+
+from siteth.index import indexed_transactions, discover_contracts, print_contracts
+from siteth.scanner import scan_transactions
+from siteth.topology import load_topology
+
+
+def get_contracts(args):
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not args.sender:
+        args.sender = random.choice(topology.indexes())
+
+    accounts = []
+    with open(os.path.join(os.path.abspath(args.workspace), 'net-info', 'accounts.json'), 'r') as reader:
+        accounts = json.load(reader)
+
+    print_contracts(discover_contracts(os.path.abspath(args.workspace), topology.node(args.sender).rpc, accounts,
+                                       not args.noIndex, args.scanBatch, args.scanInflight))
+
+
+def contracts_of(args):
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not args.sender:
+        args.sender = random.choice(topology.indexes())
+
+    if args.noIndex:
+        scan_transactions(topology.node(args.sender).rpc, args.contractsOf, True,
+                          args.fromBlock, args.toBlock, args.scanBatch, args.scanInflight)
+    else:
+        indexed_transactions(os.path.abspath(args.workspace), topology.node(args.sender).rpc, args.contractsOf, True,
+                             args.fromBlock, args.toBlock, args.scanBatch, args.scanInflight)
+
+
+def transactions_of(args):
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not args.sender:
+        args.sender = random.choice(topology.indexes())
+
+    if args.noIndex:
+        scan_transactions(topology.node(args.sender).rpc, args.transactionsOf, False,
+                          args.fromBlock, args.toBlock, args.scanBatch, args.scanInflight)
+    else:
+        indexed_transactions(os.path.abspath(args.workspace), topology.node(args.sender).rpc, args.transactionsOf, False,
+                             args.fromBlock, args.toBlock, args.scanBatch, args.scanInflight)
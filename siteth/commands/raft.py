@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+from siteth.raft import raft_peering
+from siteth.topology import load_topology
+
+
+def execute(args):
+    logging.info("Building Raft Consensus Network")
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not raft_peering(os.path.abspath(args.workspace), topology.static_nodes(), timeout=args.gethTimeout):
+        raise RuntimeError("Raft cluster is incomplete, see the missing peers above")
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import logging
+
+from siteth.genesis import init_genesis
+from siteth.snapshot import snapshot_path, restore_snapshot
+from siteth.topology import load_topology
+
+
+def execute(args):
+    logging.info("Reset network chain")
+    # --build keeps the post init state, restoring it is much cheaper than geth init
+    if os.path.exists(os.path.join(snapshot_path(os.path.abspath(args.workspace), 'genesis'), 'snapshot.json')):
+        restore_snapshot(os.path.abspath(args.workspace), 'genesis')
+        return
+
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    for node in topology.indexes():
+        logging.info("Reset node-{}".format(node))
+        geth = os.path.join(topology.datadir(node), 'geth')
+        shutil.rmtree(geth)
+
+    # chain is re-initialised, drop the transaction index
+    if os.path.exists(os.path.join(os.path.abspath(args.workspace), 'net-info', 'index.sqlite')):
+        os.remove(os.path.join(os.path.abspath(args.workspace), 'net-info', 'index.sqlite'))
+
+    init_genesis(os.path.abspath(args.workspace), topology.indexes(), args.buildWorkers)
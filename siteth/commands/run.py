@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+
+from siteth.config import GETH, GETH_DEBUG, GO_DEBUGGER, GETH_PARAMS
+from siteth.placement import (available_cpus, describe_placement, parse_cpus, parse_pins, plan_placement,
+                              read_placement, remove_placement, write_placement)
+from siteth.raft import raft_peering
+from siteth.supervisor import supervise, stop_processes
+from siteth.tessera import start_tessera, wait_tessera
+from siteth.topology import load_topology, busy_ports, write_topology
+from siteth.unlock import unlock_accounts
+from siteth.workspace import read_workspace_settings
+
+
+def process_placements(args, topology, private):
+    # A new plan when placement flags are given, otherwise the plan of the previous --run
+    workspace = os.path.abspath(args.workspace)
+    if args.placement == 'off':
+        remove_placement(workspace)
+        return {}
+    if not (args.placement == 'auto' or args.placementNodes or args.memoryLimit or args.cpuLimit):
+        return read_placement(workspace)
+    names = []
+    for node in topology.indexes():
+        if str(node) not in args.skipGeth:
+            names.append('geth-{}'.format(node))
+        if private:
+            names.append('tessera-{}'.format(node))
+    plan = plan_placement(names, parse_cpus(args.placementCpus) if args.placementCpus else available_cpus(),
+                          args.cpusPerProcess, parse_pins(args.placementNodes), args.memoryLimit, args.cpuLimit)
+    write_placement(workspace, plan)
+    for name in names:
+        logging.info("{} placement {}".format(name, describe_placement(plan[name])))
+    return plan
+
+
+def execute(args):
+    logging.info("Run Quorum Infrastructure")
+    stop_processes(os.path.abspath(args.workspace), ['geth-', 'tessera-'], args.stopTimeout)
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    if not os.path.exists(os.path.join(os.path.abspath(args.workspace), 'net-info', 'topology.json')):
+        write_topology(topology)
+    # geth of --skipGeth nodes is started by hand later
+    owners = {port: 'node-{} {}'.format(node, role) for port, node, role in topology.ports()
+              if str(node) not in args.skipGeth or role.startswith('tessera')}
+    busy = busy_ports(sorted(owners))
+    if busy:
+        logging.warning("Ports already in use, these endpoints will fail to start: {}".format(
+            ', '.join(['{} ({})'.format(port, owners[port]) for port in busy])))
+
+    debug_target = []
+    if args.debug:
+        if args.debug == '*':
+            debug_target = topology.indexes()
+        else:
+            debug_target = [int(o) for o in args.debug.replace(' ', '').split(",") if o != '']
+
+        logging.info("Debugging the following geth, tessera instances {}".format(debug_target))
+
+    private = True if args.private else True if len(
+        os.listdir(os.path.join(os.path.abspath(args.workspace), 'net-info', 'tessera'))) > 0 else False
+    placements = process_placements(args, topology, private)
+    if private:
+        logging.info("Run Tessera network")
+        start_tessera(os.path.abspath(args.workspace), topology, debug_target,
+                      args.restartCrashed, args.stopTimeout, args.logSize * 1024 * 1024, args.logFiles, placements)
+        wait_tessera(os.path.abspath(args.workspace), len(topology), args.tesseraTimeout)
+        logging.info("Tessera infrastructure was successfully bootstrapped")
+
+    logging.info("Building geth infrastructure")
+    keystore_param = ''
+    if read_workspace_settings(os.path.abspath(args.workspace)).get('keystore') == 'shared':
+        keystore_param = '--keystore {}'.format(os.path.join(os.path.abspath(args.workspace), 'net-info', 'keystore'))
+    isRaft = topology.consensus == 'raft'
+    for node in topology.indexes():
+        ports = topology.node(node)
+        exec = ''
+        env = {}
+        consensus_param = '--raft --raftport {}'.format(
+            ports.raft) if isRaft else '--istanbul.blockperiod {} --syncmode full --mine --minerthreads 1'.format(
+            args.size)
+        if args.gethParams:
+            # shared keystore nodes have no node-N/keystore, they need --keystore whatever the custom parameters
+            exec = "{} --datadir {} {}".format(GETH, topology.datadir(node),
+                                               keystore_param + ' ' if keystore_param else '') + args.gethParams
+        else:
+            nodetx = topology.tessera_dir(node)
+            private = nodetx is not None and os.path.exists(nodetx)
+            if private:
+                geth_params = GETH_PARAMS.format(
+                    GETH if node not in debug_target else GETH_DEBUG,
+                    "--permissioned" if os.path.exists(
+                        os.path.join(topology.datadir(node), 'permissioned-nodes.json')) else '',
+                    topology.datadir(node),
+                    keystore_param,
+                    args.verbosity,
+                    consensus_param,
+                    ports.rpc,
+                    topology.consensus,
+                    ports.p2p
+                )
+                env = {'PRIVATE_CONFIG': '{}/tm.ipc'.format(nodetx)}
+                exec = geth_params if node not in debug_target else '{} exec {}'.format(GO_DEBUGGER, geth_params)
+            else:
+                geth_params = GETH_PARAMS.format(
+                    GETH if node not in debug_target else GETH_DEBUG,
+                    "--permissioned" if os.path.exists(
+                        os.path.join(topology.datadir(node), 'permissioned-nodes.json')) else '',
+                    topology.datadir(node),
+                    keystore_param,
+                    args.verbosity,
+                    consensus_param,
+                    ports.rpc,
+                    topology.consensus,
+                    ports.p2p
+                )
+                if node in debug_target:
+                    exec = '{} exec {} '.format(GO_DEBUGGER, geth_params)
+                else:
+                    exec = geth_params
+
+        if str(node) in args.skipGeth:
+            print()
+            print('skipGeth: {}{}'.format(''.join(['{}={} '.format(k, v) for k, v in env.items()]), exec))
+            print()
+        else:
+            supervise(os.path.abspath(args.workspace), 'geth-{}'.format(node), exec,
+                      os.path.join(topology.datadir(node), 'node.log'),
+                      env, args.restartCrashed, args.stopTimeout, args.logSize * 1024 * 1024, args.logFiles,
+                      placements.get('geth-{}'.format(node)))
+            logging.info("Geth infrastructure was successfully bootstrapped")
+
+            if args.debug and node in debug_target:
+                logging.info("Debug was enabled waiting. Type next to continue")
+                if private:
+                    logging.info("Attach to the following endpoints for tessera debug sessions:")
+                    for o in debug_target:
+                        logging.info("for node-tx-{} -> http://127.0.0.1:{}".format(o, topology.node(o).tessera_debug))
+
+                exit_waiting = False
+                while (not exit_waiting and node in debug_target):
+                    user_signal = input("> ")
+                    if user_signal == 'next':
+                        exit_waiting = True
+                    if user_signal == 'stop':
+                        logging.info("Stoping Network")
+                        stop_processes(os.path.abspath(args.workspace), timeout=args.stopTimeout)
+                        logging.info("Network processes has been terminated")
+                        exit(0)
+
+    if isRaft:
+        logging.info("Building Raft Consensus Network")
+        if not raft_peering(os.path.abspath(args.workspace), topology.static_nodes(), args.skipGeth, args.gethTimeout):
+            raise RuntimeError("Raft cluster is incomplete, see the missing peers above")
+
+    # Read Accounts
+    logging.info("Unlock Random Accounts in each node for operations")
+    with open(os.path.join(args.workspace, 'net-info', 'accounts.json'), 'r') as accountsReader:
+        accounts = json.load(accountsReader)
+
+    ipcs = {node: os.path.join(topology.datadir(node), 'geth.ipc') for node in topology.indexes(args.skipGeth)}
+    if not unlock_accounts(ipcs, accounts, args.unlockCount, args.unlockDuration, args.gethTimeout):
+        raise RuntimeError("Account unlock failed on some nodes, see the errors above")
+
+    logging.info("Quorum infrastructure was successfully started")
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import logging
+
+from siteth.snapshot import take_snapshot, restore_snapshot
+from siteth.topology import load_topology
+from siteth.workspace import running_processes
+
+
+def require_stopped(workspace):
+    running = running_processes(workspace, ['geth-', 'tessera-'])
+    if running:
+        raise RuntimeError("Stop the network before taking or restoring snapshots, still running: {}".format(
+            ', '.join(running)))
+
+
+def check_name(name, take=False):
+    if not re.match(r'^[A-Za-z0-9._-]+$', name) or name in ('.', '..'):
+        raise RuntimeError("Invalid snapshot name {}, use letters, digits, '.', '_' or '-'".format(name))
+    # genesis is the post init state --reset goes back to, only --build takes it
+    if take and name == 'genesis':
+        raise RuntimeError("The genesis snapshot is taken by --build, choose another name")
+
+
+def take(args):
+    check_name(args.snapshot, take=True)
+    require_stopped(os.path.abspath(args.workspace))
+    logging.info("Taking snapshot {}".format(args.snapshot))
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    take_snapshot(os.path.abspath(args.workspace), args.snapshot, topology.indexes(), tessera=True)
+
+
+def restore(args):
+    check_name(args.restore)
+    require_stopped(os.path.abspath(args.workspace))
+    logging.info("Restoring snapshot {}".format(args.restore))
+    restore_snapshot(os.path.abspath(args.workspace), args.restore)
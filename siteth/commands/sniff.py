@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+
+from siteth.config import SNIFF
+from siteth.pcap import ring_files, split_pcap
+from siteth.topology import load_topology
+from siteth.traffic import find_session
+from siteth.supervisor import supervise, stop_processes
+
+
+def clear(args):
+    stop_processes(os.path.abspath(args.workspace), ['tshark-'], args.stopTimeout)
+    logging.info("Clear Traffic information")
+    shutil.rmtree(os.path.join(os.path.abspath(args.workspace), 'net-info', 'traffic'))
+    os.mkdir(os.path.join(os.path.abspath(args.workspace), 'net-info', 'traffic'))
+    logging.info("Traffic information was cleared")
+
+
+def stop(args):
+    logging.info("Stoping Sniffers")
+    stop_processes(os.path.abspath(args.workspace), ['tshark-'], args.stopTimeout)
+    logging.info("Sniffers has been terminated")
+
+
+def start(args):
+    if not args.sniffName:
+        args.sniffName = datetime.now().strftime("%d-%m-%Y-%H:%M:%S")
+
+    session_folder = os.path.join(os.path.abspath(args.workspace), 'net-info', 'traffic', args.sniffName)
+    os.mkdir(session_folder)
+
+    # One capture for every node: geth, raft & rpc ports per node plus the Tessera peer ports
+    topology = load_topology(os.path.abspath(args.workspace), args.rpcStartPort, args.tesserDebugPortStart)
+    roles = topology.roles()
+    targets = {port: os.path.join('tessera', 'tessera.pcap') if role == 'tessera' else
+               os.path.join('geth', 'node-{}'.format(node), 'geth.pcap') for port, (node, role) in roles.items()}
+    with open(os.path.join(session_folder, 'capture.json'), 'w') as writer:
+        json.dump({'targets': targets, 'roles': roles}, writer)
+
+    capture_folder = os.path.join(session_folder, 'capture')
+    os.mkdir(capture_folder)
+    supervise(os.path.abspath(args.workspace), 'tshark-capture', SNIFF.format(
+        'tcp port ({})'.format(' or '.join([str(o) for o in sorted(targets)])),
+        args.sniffFileSize * 1000, args.sniffFiles, os.path.join(capture_folder, 'capture.pcap')
+    ), os.path.join(session_folder, 'tshark.log'), stop_timeout=args.stopTimeout)
+
+    logging.info("Sniffer output:")
+    logging.info("Capture:{} (ring of {} x {}MB)".format(capture_folder, args.sniffFiles, args.sniffFileSize))
+    logging.info("Split per node with: --sniffSplit --sniffName {}".format(args.sniffName))
+
+
+def split(args):
+    session_folder = find_session(os.path.abspath(args.workspace), args.sniffName)
+
+    with open(os.path.join(session_folder, 'capture.json'), 'r') as reader:
+        targets = {int(port): path for port, path in json.load(reader)['targets'].items()}
+    paths = ring_files(os.path.join(session_folder, 'capture'))
+    logging.info("Splitting {} capture files of {}".format(len(paths), os.path.basename(session_folder)))
+    counts = split_pcap(paths, targets, session_folder)
+    for target in sorted(counts):
+        logging.info("{}: {} packets".format(os.path.join(session_folder, target), counts[target]))
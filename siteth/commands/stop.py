@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+from siteth.supervisor import stop_processes
+
+
+def execute(args):
+    logging.info("Stoping Network")
+    stop_processes(os.path.abspath(args.workspace), timeout=args.stopTimeout)
+    logging.info("Network processes has been terminated")
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+import os
+import asyncio
+
+from siteth.supervisor import Supervisor
+
+
+def execute(args):
+    asyncio.run(Supervisor(os.path.abspath(args.workspace), args.stopTimeout).serve())
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+from siteth.traffic import find_session, query_session, session_start
+
+
+def execute(args):
+    session = find_session(os.path.abspath(args.workspace), args.sniffName)
+    # --trafficFrom / --trafficTo are seconds since the first captured packet
+    origin = session_start(session)
+    start = origin + args.trafficFrom if args.trafficFrom is not None else None
+    end = origin + args.trafficTo if args.trafficTo is not None else None
+    totals = query_session(session, args.trafficNode, args.trafficPort, start, end, args.trafficOut)
+
+    print("+ Traffic: {}".format(session))
+    print("{:<6} {:<8} {:<4} {:>10} {:>14} {:>10} {:>10}".format(
+        'node', 'role', 'dir', 'packets', 'bytes', 'first(s)', 'last(s)'))
+    for flow in sorted(totals):
+        packets, size, first, last = totals[flow]
+        print("{:<6} {:<8} {:<4} {:>10} {:>14} {:>10.3f} {:>10.3f}".format(
+            flow[0], flow[1], flow[2], packets, size, first - origin, last - origin))
+    if args.trafficOut:
+        logging.info("Matching packets written to {}".format(args.trafficOut))
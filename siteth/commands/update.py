@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import logging
+import tarfile
+import requests
+
+VERSIONS = {'geth': '2.7.0', 'tessera': '0.10.6', 'istanbul': '1.0.3', 'bootnode': '1.9.7'}
+
+
+def download(src, dst):
+    r = requests.get(src, allow_redirects=True)
+    open(dst, 'wb').write(r.content)
+
+
+def extract(src, dst):
+    my_tar = tarfile.open(src)
+    my_tar.extractall(dst)
+    my_tar.close()
+
+
+def execute(args):
+    logging.info("updating {}".format(VERSIONS))
+    if not os.path.exists(".siteth-tmp"):
+        os.mkdir(".siteth-tmp")
+
+    geth_path = "https://bintray.com/quorumengineering/quorum/download_file?file_path=v{}/geth_v{}_darwin_amd64.tar.gz".format(VERSIONS['geth'], VERSIONS['geth'])
+    tessera_path = "https://oss.sonatype.org/service/local/repositories/releases/content/com/jpmorgan/quorum/tessera-app/{}/tessera-app-{}-app.jar".format(VERSIONS['tessera'], VERSIONS['tessera'])
+    istanbul_path = "https://bintray.com/api/ui/download/quorumengineering/istanbul-tools/istanbul-tools_v{}_darwin_amd64.tar.gz".format(VERSIONS['istanbul'])
+    bootnode_path = "https://bintray.com/api/ui/download/quorumengineering/geth-bootnode/bootnode_v{}_darwin_amd64.tar.gz".format(VERSIONS['bootnode'])
+
+    logging.info("Downloading {}".format(geth_path))
+    download(geth_path,".siteth-tmp/geth.tar.gz")
+    extract(".siteth-tmp/geth.tar.gz","./res/bin")
+
+    logging.info("Downloading {}".format(tessera_path))
+    download(tessera_path, "./res/bin/tessera.jar")
+
+    logging.info("Downloading {}".format(istanbul_path))
+    download(istanbul_path,".siteth-tmp/istanbul.tar.gz")
+    extract(".siteth-tmp/istanbul.tar.gz","./res/bin")
+
+    logging.info("Downloading {}".format(bootnode_path))
+    download(bootnode_path, ".siteth-tmp/bootnode.tar.gz")
+    extract(".siteth-tmp/bootnode.tar.gz", "./res/bin")
+
+    shutil.rmtree(".siteth-tmp")
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+SNIFF = "tshark -i lo -f \"{}\" -n -q -F pcap -b filesize:{} -b files:{} -w {}"
+GETH_PARAMS = "{} {} --datadir {} {} --nodiscover --verbosity {} --networkid 31337 {} --rpc --rpcaddr 127.0.0.1 --rpcport {} --rpcapi admin,db,eth,debug,miner,net,shh,txpool,personal,web3,quorum,{} --allow-insecure-unlock --emitcheckpoints --port {}"
+GETH_EXECUTE_RPC = "{} attach {}/geth.ipc --exec \"{}\""
+ISTANBUL_SETUP_NETWORK = "setup --num {} --nodes --quorum --save --verbose"
+
+RES = os.getenv("RES_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'res'))
+GETH = os.getenv("GETH_PATH", os.path.join(RES, 'bin', 'geth'))
+GETH_DEBUG = os.getenv("GETH_DEBUG_PATH", os.path.join(RES, 'bin', 'geth-debug'))
+GO_DEBUGGER = os.getenv("GO_DEBUGGER_PATH", os.path.join(RES, 'bin', 'gdlv'))
+ISTANBUL = os.getenv("ISTANBUL_PATH", os.path.join(RES, 'bin', 'istanbul'))
+TESSERA = os.getenv("TESSERA_PATH", os.path.join(RES, 'bin', 'tessera.jar'))
+BOOTNODE = os.getenv("BOOTNODE_PATH", os.path.join(RES, 'bin', 'bootnode'))
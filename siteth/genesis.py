@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from siteth.config import GETH
+
+
+def init_node_genesis(workspace, node):
+    # Runs `geth init` for one node, returns (node, exit code, stderr)
+    process = subprocess.run([GETH, '--datadir', os.path.join(workspace, 'node-{}'.format(node)),
+                              'init', os.path.join(workspace, 'net-info', 'genesis.json')],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    return node, process.returncode, process.stderr
+
+
+def init_genesis(workspace, nodes, workers=None):
+    # Initialise every node genesis concurrently, stop scheduling on first failure and report per node
+    nodes = list(nodes)
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers or os.cpu_count() or 1, len(nodes) or 1))) as pool:
+        futures = [pool.submit(init_node_genesis, workspace, node) for node in nodes]
+        for future in as_completed(futures):
+            node, code, stderr = future.result()
+            if code != 0:
+                failures[node] = (code, stderr)
+                for pending in futures:
+                    pending.cancel()
+
+    if failures:
+        for node in sorted(failures):
+            code, stderr = failures[node]
+            logging.error("node-{} geth init failed with exit code {}".format(node, code))
+            for line in stderr.strip().splitlines()[-5:]:
+                logging.error("node-{}: {}".format(node, line))
+        raise RuntimeError("geth init failed for node(s) {}".format(sorted(failures)))
+    logging.info("Genesis state written for {} nodes".format(len(nodes)))
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+
+from siteth.rpc import rpc_session, rpc_batch, rpc_call
+from siteth.scanner import scan_blocks
+
+INDEX_VERSION = '2'
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS transactions (
+    hash TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    sender TEXT,
+    recipient TEXT,
+    creation INTEGER NOT NULL,
+    contract TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_sender ON transactions (sender, block);
+CREATE INDEX IF NOT EXISTS transactions_recipient ON transactions (recipient, block);
+CREATE INDEX IF NOT EXISTS transactions_creation ON transactions (creation, sender, block);
+"""
+
+
+def index_get(db, key, default=None):
+    row = db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else default
+
+
+def index_set(db, key, value):
+    db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+
+def index_clear(db):
+    db.execute('DELETE FROM transactions')
+    db.execute('DELETE FROM blocks')
+    db.execute('DELETE FROM meta')
+    index_set(db, 'version', INDEX_VERSION)
+    index_set(db, 'last_block', -1)
+
+
+def open_index(workspace):
+    db = sqlite3.connect(os.path.join(workspace, 'net-info', 'index.sqlite'))
+    db.executescript(INDEX_SCHEMA)
+    if index_get(db, 'version') != INDEX_VERSION:
+        db.executescript('DROP TABLE transactions; DROP TABLE blocks; DROP TABLE meta;' + INDEX_SCHEMA)
+        index_clear(db)
+        db.commit()
+    return db
+
+
+def index_block(db, block, creations):
+    # creations collects contract creation hashes, their receipts are fetched in batch by index_receipts
+    number = int(block['number'], 16)
+    db.execute('INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)', (number, block['hash']))
+    for tx in block.get('transactions', []):
+        tx['timestamp'] = int(block['timestamp'], 16)
+        db.execute('INSERT OR REPLACE INTO transactions (hash, block, position, sender, recipient, creation, data) '
+                   'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                   (tx['hash'], number, int(tx['transactionIndex'], 16), (tx.get('from') or '').lower(),
+                    (tx.get('to') or '').lower() or None, 0 if tx.get('to') else 1, json.dumps(tx)))
+        if not tx.get('to'):
+            creations.append(tx['hash'])
+    return number
+
+
+def fetch_contract_addresses(session, port, hashes):
+    responses = rpc_batch(session, port, [('eth_getTransactionReceipt', [o]) for o in hashes])
+    return [(o.get('result') or {}).get('contractAddress') for o in responses]
+
+
+def index_receipts(db, session, port, creations):
+    if creations:
+        for tx, contract in zip(creations, fetch_contract_addresses(session, port, creations)):
+            db.execute('UPDATE transactions SET contract = ? WHERE hash = ?', (contract, tx))
+        del creations[:]
+
+
+def index_rewind(db, number):
+    db.execute('DELETE FROM transactions WHERE block > ?', (number,))
+    db.execute('DELETE FROM blocks WHERE number > ?', (number,))
+    index_set(db, 'last_block', number)
+
+
+def sync_index(db, session, port, batch=100, inflight=4):
+    # Bring the index up to the chain head, rewinding on reorgs and rebuilding on a re-initialised chain
+    head = int(rpc_call(session, port, 'eth_blockNumber'), 16)
+    genesis = rpc_call(session, port, 'eth_getBlockByNumber', ['0x0', False])['hash']
+    if index_get(db, 'genesis') != genesis:
+        if index_get(db, 'genesis'):
+            logging.warning("Chain genesis changed, rebuilding transaction index")
+        index_clear(db)
+        index_set(db, 'genesis', genesis)
+
+    last = min(int(index_get(db, 'last_block', -1)), head)
+    while last >= 0:
+        start = max(0, last - batch + 1)
+        stored = dict(db.execute('SELECT number, hash FROM blocks WHERE number BETWEEN ? AND ?', (start, last)))
+        chain = fetch_blocks_hashes(session, port, start, last)
+        ancestor = [number for number in range(last, start - 1, -1) if stored.get(number) == chain[number - start]]
+        if ancestor:
+            if ancestor[0] != last:
+                logging.warning("Chain reorganised after block {}, reindexing".format(ancestor[0]))
+            last = ancestor[0]
+            break
+        last = start - 1
+    index_rewind(db, last)
+    db.commit()
+
+    if last < head:
+        logging.info("Indexing blocks {} to {}".format(last + 1, head))
+        creations = []
+        try:
+            for block in scan_blocks(session, port, last + 1, head, batch, inflight):
+                last = index_block(db, block, creations)
+                if last % batch == 0:
+                    index_receipts(db, session, port, creations)
+                    index_set(db, 'last_block', last)
+                    db.commit()
+            index_receipts(db, session, port, creations)
+        finally:
+            if creations:
+                # receipts were not fetched, keep them out of the index so the next sync picks them up
+                last = int(db.execute('SELECT MIN(block) FROM transactions WHERE hash IN ({})'.format(
+                    ','.join('?' * len(creations))), creations).fetchone()[0]) - 1
+                index_rewind(db, last)
+            index_set(db, 'last_block', last)
+            db.commit()
+    index_set(db, 'head_hash', chain_hash(session, port, last) if last >= 0 else '')
+    db.commit()
+    return last
+
+
+def fetch_blocks_hashes(session, port, start, end):
+    responses = rpc_batch(session, port, [('eth_getBlockByNumber', [hex(number), False])
+                                          for number in range(start, end + 1)])
+    return [(o.get('result') or {}).get('hash') for o in responses]
+
+
+def chain_hash(session, port, number):
+    return fetch_blocks_hashes(session, port, number, number)[0]
+
+
+def query_index(workspace, port, account, contracts_only=False, start=0, end=None, batch=100, inflight=4):
+    # Sync net-info/index.sqlite with the chain then yield matching transactions as JSON text
+    session = rpc_session(max(1, inflight))
+    db = open_index(workspace)
+    try:
+        last = sync_index(db, session, port, batch, inflight)
+    except KeyboardInterrupt:
+        logging.warning("Indexing interrupted, answering from the blocks indexed so far")
+        last = int(index_get(db, 'last_block', -1))
+    finally:
+        session.close()
+
+    query = 'SELECT data FROM transactions WHERE block BETWEEN ? AND ?'
+    params = [start, last if end is None else min(end, last)]
+    account = account.lower()
+    if account != '*':
+        query = query + (' AND creation = 1 AND sender = ?' if contracts_only else ' AND (sender = ? OR recipient = ?)')
+        params = params + ([account] if contracts_only else [account, account])
+    elif contracts_only:
+        query = query + ' AND creation = 1'
+
+    try:
+        for row in db.execute(query + ' ORDER BY block, position', params):
+            yield row[0]
+    finally:
+        db.close()
+
+
+def indexed_transactions(workspace, port, account, contracts_only=False, start=0, end=None, batch=100, inflight=4):
+    # Answer from the index as JSONL
+    matched = 0
+    for tx in query_index(workspace, port, account, contracts_only, start, end, batch, inflight):
+        sys.stdout.write(tx + '\n')
+        matched = matched + 1
+    sys.stdout.flush()
+    logging.info("Total Transactions: {}".format(matched))
+    return matched
+
+
+def print_contracts(contracts):
+    for account in sorted(contracts):
+        print(json.dumps({'account': account, 'contracts': contracts[account]}))
+
+
+def discover_contracts(workspace, port, accounts, use_index=True, batch=100, inflight=4):
+    # One pass over contract creations matched against the whole account set, grouped per account
+    session = rpc_session(max(1, inflight))
+    wanted = set([o['account'].lower() for o in accounts])
+    contracts = {}
+    found = []
+    try:
+        if use_index:
+            db = open_index(workspace)
+            sync_index(db, session, port, batch, inflight)
+            rows = db.execute('SELECT sender, contract, data FROM transactions WHERE creation = 1 '
+                              'ORDER BY block, position').fetchall()
+            db.close()
+        else:
+            end = int(rpc_call(session, port, 'eth_blockNumber'), 16)
+            rows = []
+            for block in scan_blocks(session, port, 0, end, batch, inflight):
+                for tx in block.get('transactions', []):
+                    if not tx.get('to'):
+                        tx['timestamp'] = int(block['timestamp'], 16)
+                        rows.append(((tx.get('from') or '').lower(), None, tx))
+
+        for sender, contract, data in rows:
+            if sender in wanted:
+                tx = json.loads(data) if isinstance(data, str) else data
+                found.append({'contract': contract, 'hash': tx['hash'], 'block': int(tx['blockNumber'], 16),
+                              'timestamp': tx.get('timestamp'), 'input': tx.get('input')})
+                contracts.setdefault(sender, []).append(found[-1])
+
+        missing = [o for o in found if not o['contract']]
+        for o, contract in zip(missing, fetch_contract_addresses(session, port, [o['hash'] for o in missing])):
+            o['contract'] = contract
+        deployed = [o for o in found if o['contract']]
+        codes = rpc_batch(session, port, [('eth_getCode', [o['contract'], 'latest']) for o in deployed]) \
+            if deployed else []
+        for o, code in zip(deployed, codes):
+            o['code'] = code.get('result')
+    finally:
+        session.close()
+
+    logging.info("Found {} contracts created by {} of {} accounts".format(len(found), len(contracts), len(wanted)))
+    return contracts
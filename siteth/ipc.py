@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import socket
+
+
+class IPCClient(object):
+    # Persistent JSON-RPC connection to geth.ipc, replaces one `geth attach` console per call
+
+    def __init__(self, path, timeout=60):
+        self.path = path
+        self.counter = 0
+        self.buffer = b''
+        self.decoder = json.JSONDecoder()
+        deadline = time.time() + timeout
+        while True:
+            try:
+                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.socket.connect(path)
+                break
+            except OSError:
+                self.socket.close()
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.2)
+        self.socket.settimeout(timeout)
+
+    def close(self):
+        self.socket.close()
+
+    def read(self):
+        while True:
+            text = self.buffer.decode('utf-8', 'ignore').lstrip()
+            if text:
+                try:
+                    result, end = self.decoder.raw_decode(text)
+                    self.buffer = text[end:].encode('utf-8')
+                    return result
+                except ValueError:
+                    pass
+            chunk = self.socket.recv(65536)
+            if not chunk:
+                raise ConnectionError("{} closed the connection".format(self.path))
+            self.buffer = self.buffer + chunk
+
+    def batch(self, calls):
+        # calls: [(method, params)], returns responses in the same order
+        if not calls:
+            return []
+        payload = []
+        for method, params in calls:
+            self.counter = self.counter + 1
+            payload.append({'jsonrpc': '2.0', 'id': self.counter, 'method': method, 'params': params})
+        self.socket.sendall(json.dumps(payload).encode('utf-8'))
+        result = self.read()
+        responses = {o.get('id'): o for o in (result if isinstance(result, list) else [result])}
+        return [responses.get(o['id'], {'error': {'message': 'missing response'}}) for o in payload]
+
+    def call(self, method, params=None):
+        response = self.batch([(method, params or [])])[0]
+        if 'error' in response:
+            raise RuntimeError("{}: {}".format(method, response['error'].get('message')))
+        return response.get('result')
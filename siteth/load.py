@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+import math
+import time
+import random
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from siteth.rpc import rpc_session, rpc_batch, rpc_call
+from siteth.unlock import unlock_node_accounts
+
+# Counter contract: init code copies and returns the 10 byte runtime `sload(0) + 1 -> sstore(0)`
+COUNTER_CODE = '0x600a600c600039600a6000f3' + '60005460010160005500'
+LOAD_GAS = {'transfer': 21000, 'call': 50000, 'private': 100000}
+LOAD_POLL = 0.05
+
+
+def parse_mix(mix):
+    # "transfer:60,call:30,private:10" -> {'transfer': 0.6, 'call': 0.3, 'private': 0.1}
+    weights = {}
+    for entry in [o for o in mix.split(',') if o.strip()]:
+        kind, _, weight = entry.partition(':')
+        if kind.strip() not in LOAD_GAS:
+            raise RuntimeError("Unknown load kind {}, use {}".format(kind, ', '.join(sorted(LOAD_GAS))))
+        weights[kind.strip()] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise RuntimeError("Load mix {} has no weight".format(mix))
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    # nearest rank
+    rank = lambda p: values[max(0, int(math.ceil(p * len(values) / 100.0)) - 1)]
+    return {'count': len(values), 'min': values[0], 'p50': rank(50), 'p90': rank(90), 'p99': rank(99),
+            'max': values[-1], 'mean': sum(values) / len(values)}
+
+
+def wait_receipt(session, port, tx, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        receipt = rpc_call(session, port, 'eth_getTransactionReceipt', [tx])
+        if receipt:
+            return receipt
+        time.sleep(LOAD_POLL)
+    raise RuntimeError("Transaction {} was not mined after {}s".format(tx, timeout))
+
+
+class LoadGenerator(object):
+    # Paced eth_sendTransaction load from accounts pinned to nodes, nonces are tracked locally so every account
+    # has at most one submission in flight and never waits on eth_getTransactionCount
+
+    def __init__(self, ports, accounts, tessera_keys, timeout=60):
+        # ports: {node: rpc port}
+        self.nodes = sorted(ports)
+        self.ports = dict(ports)
+        self.accounts = accounts
+        self.tessera_keys = tessera_keys
+        self.timeout = timeout
+        self.session = rpc_session(64)
+        # account -> sending node, round robin
+        self.owner = {o['account']: self.nodes[i % len(self.nodes)] for i, o in enumerate(accounts)}
+        self.nonces = {}
+        self.idle = deque([o['account'] for o in accounts])
+        self.condition = threading.Condition()
+        self.sent = {}
+        self.included = {}
+        self.errors = []
+        self.counter = None
+        self.tracking = None
+
+    def prepare(self):
+        for node in self.nodes:
+            mine = [o for o in self.accounts if self.owner[o['account']] == node]
+            for account, unlocked, error in unlock_node_accounts(self.session, node, self.ports[node], mine,
+                                                                 0, self.timeout):
+                if not unlocked:
+                    raise RuntimeError("Node:{} Account:{} unlock failed: {}".format(node, account, error))
+            for o, response in zip(mine, rpc_batch(self.session, self.ports[node], [
+                    ('eth_getTransactionCount', [o['account'], 'pending']) for o in mine], self.timeout)):
+                self.nonces[o['account']] = int(response['result'], 16)
+
+        # public counter used by `call` transactions
+        account = self.accounts[0]['account']
+        port = self.ports[self.owner[account]]
+        tx = rpc_call(self.session, port, 'eth_sendTransaction', [{
+            'from': account, 'data': COUNTER_CODE, 'gas': hex(LOAD_GAS['private']), 'gasPrice': '0x0',
+            'nonce': hex(self.nonces[account])}])
+        self.nonces[account] = self.nonces[account] + 1
+        self.counter = wait_receipt(self.session, port, tx, self.timeout)['contractAddress']
+        logging.info("Counter contract deployed at {}".format(self.counter))
+
+    def transaction(self, account, kind, node):
+        tx = {'from': account, 'gas': hex(LOAD_GAS[kind]), 'gasPrice': '0x0', 'nonce': hex(self.nonces[account])}
+        if kind == 'transfer':
+            tx.update(to=random.choice(self.accounts)['account'], value='0x1')
+        elif kind == 'call':
+            tx.update(to=self.counter)
+        else:
+            # private counter creation shared with one other node, exercises the full Tessera send path
+            peers = [o for o in self.tessera_keys if o != node] or [node]
+            tx.update(data=COUNTER_CODE, privateFor=[self.tessera_keys[random.choice(peers)]])
+        return tx
+
+    def send(self, account, kind):
+        node = self.owner[account]
+        started = time.time()
+        nonce = None
+        try:
+            response = rpc_batch(self.session, self.ports[node], [
+                ('eth_sendTransaction', [self.transaction(account, kind, node)])], self.timeout)[0]
+        except Exception as e:
+            response = {'error': {'message': str(e)}}
+            # the node may have accepted it before the call failed, take the nonce back from the node
+            try:
+                nonce = int(rpc_call(self.session, self.ports[node], 'eth_getTransactionCount',
+                                     [account, 'pending'], self.timeout), 16)
+            except Exception as e:
+                logging.warning("Node:{} Account:{} nonce could not be read back: {}".format(node, account, e))
+        submitted = time.time()
+        with self.condition:
+            if 'error' in response:
+                self.errors.append({'kind': kind, 'node': node, 'error': response['error'].get('message')})
+                if nonce is not None:
+                    self.nonces[account] = nonce
+            else:
+                self.nonces[account] = self.nonces[account] + 1
+                self.sent[response['result']] = {'kind': kind, 'node': node, 'started': started,
+                                                 'submitted': submitted}
+            self.idle.append(account)
+            self.condition.notify()
+
+    def track(self, port, head, stop):
+        # Record the local time each transaction is first seen in a block on port. Errors are retried,
+        # self.tracking keeps the last one until a poll succeeds again
+        while not stop.is_set():
+            try:
+                latest = int(rpc_call(self.session, port, 'eth_blockNumber'), 16)
+                if latest > head:
+                    seen = time.time()
+                    for block in rpc_batch(self.session, port, [('eth_getBlockByNumber', [hex(o), False])
+                                                                for o in range(head + 1, latest + 1)], self.timeout):
+                        for tx in (block.get('result') or {}).get('transactions', []):
+                            self.included.setdefault(tx, seen)
+                    head = latest
+                self.tracking = None
+            except Exception as e:
+                if self.tracking is None:
+                    logging.warning("Block tracking on port {} failed, retrying: {}".format(port, e))
+                self.tracking = str(e)
+            time.sleep(LOAD_POLL)
+
+    def run(self, rate, duration, mix):
+        kinds = sorted(mix)
+        weights = [mix[o] for o in kinds]
+        stop = threading.Event()
+        port = self.ports[self.nodes[0]]
+        tracker = threading.Thread(target=self.track, daemon=True,
+                                   args=(port, int(rpc_call(self.session, port, 'eth_blockNumber'), 16), stop))
+        tracker.start()
+
+        started = time.time()
+        scheduled = 0
+        behind = 0.0
+        with ThreadPoolExecutor(max_workers=max(1, min(64, len(self.accounts)))) as pool:
+            while time.time() - started < duration:
+                due = started + scheduled / rate
+                time.sleep(max(0.0, due - time.time()))
+                with self.condition:
+                    while not self.idle:
+                        self.condition.wait()
+                    account = self.idle.popleft()
+                behind = max(behind, time.time() - due)
+                pool.submit(self.send, account, random.choices(kinds, weights)[0])
+                scheduled = scheduled + 1
+        finished = time.time()
+        if scheduled < 0.9 * rate * duration:
+            logging.warning("Only {:.1f} of {} tx/s submitted (up to {:.1f}s behind), every account has one "
+                            "transaction in flight, add accounts or nodes".format(
+                                scheduled / (finished - started), rate, behind))
+
+        # drain: wait for submitted transactions to be mined
+        deadline = time.time() + self.timeout
+        while time.time() < deadline and any([o not in self.included for o in self.sent]):
+            time.sleep(LOAD_POLL)
+        stop.set()
+        tracker.join()
+        self.session.close()
+        if self.tracking is not None:
+            raise RuntimeError("Block tracking failed, inclusions & latencies are incomplete: {}".format(self.tracking))
+        return self.report(rate, duration, mix, started, finished, scheduled)
+
+    def report(self, rate, duration, mix, started, finished, scheduled):
+        included = [(tx, o) for tx, o in self.sent.items() if tx in self.included]
+        last = max([self.included[tx] for tx, o in included] or [finished])
+        kinds = {}
+        for kind in sorted(mix):
+            mine = [(tx, o) for tx, o in included if o['kind'] == kind]
+            kinds[kind] = {
+                'submitted': len([o for o in self.sent.values() if o['kind'] == kind]),
+                'included': len(mine),
+                'errors': len([o for o in self.errors if o['kind'] == kind]),
+                'submit': percentiles([(o['submitted'] - o['started']) * 1000 for tx, o in mine]),
+                'latency': percentiles([(self.included[tx] - o['started']) * 1000 for tx, o in mine]),
+            }
+
+        # private submission blocks on geth -> Tessera /send, the submit time above the public baseline is Tessera
+        private = kinds.get('private', {})
+        public = [(o['submitted'] - o['started']) * 1000 for tx, o in self.sent.items() if o['kind'] != 'private']
+        if private.get('included') and public:
+            tessera = max(0.0, private['submit']['p50'] - percentiles(public)['p50'])
+            private['tessera'] = {'p50': tessera, 'share': tessera / private['latency']['p50']
+                                  if private['latency']['p50'] else 0.0}
+
+        return {
+            'rate': rate, 'duration': duration, 'mix': mix, 'nodes': self.nodes, 'accounts': len(self.accounts),
+            'scheduled': scheduled, 'submitted': len(self.sent), 'included': len(included),
+            'errors': len(self.errors), 'error_samples': self.errors[:10],
+            'submit_tps': len(self.sent) / (finished - started),
+            'tps': len(included) / (last - started) if last > started else 0.0,
+            'latency': percentiles([(self.included[tx] - o['started']) * 1000 for tx, o in included]),
+            'kinds': kinds,
+        }
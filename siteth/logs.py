@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sys
+import gzip
+import time
+import heapq
+import shutil
+import struct
+import asyncio
+import datetime
+
+LOG_SIZE = 50 * 1024 * 1024
+LOG_FILES = 5
+# geth terminal format `INFO [10-18|16:10:09.568] ...`, Tessera logback `2020-10-18 16:10:09.568 ...`
+GETH_TIME = re.compile(r'^\w+\s*\[(\d\d)-(\d\d)\|(\d\d):(\d\d):(\d\d)\.(\d{3})\]')
+TESSERA_TIME = re.compile(r'^(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d):(\d\d)[.,](\d{3})')
+FOLLOW_POLL = 0.25
+# Seconds between two size checks of a supervised process log
+LOG_CHECK = 1.0
+# linux/inotify.h
+IN_MODIFY = 0x002
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+
+class RotatingLog(object):
+    # Size cap of a log a supervised process writes to directly (O_APPEND), so the process keeps running and logging
+    # when the supervisor is gone. Past `size` bytes the log is copied to <log>.1 and truncated in place
+    # (copytruncate), <log>.1 is compressed to <log>.1.gz and older files shift up to `files`. The rotation runs
+    # off the event loop
+
+    def __init__(self, path, size=LOG_SIZE, files=LOG_FILES):
+        self.path = path
+        self.size = size
+        self.files = files
+
+    def open(self):
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    async def check(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if self.size > 0 and size > self.size:
+            await asyncio.get_event_loop().run_in_executor(None, rotate_log, self.path, self.files)
+
+
+def rotate_log(path, files):
+    if os.path.exists('{}.{}.gz'.format(path, files)):
+        os.remove('{}.{}.gz'.format(path, files))
+    for index in range(files - 1, 0, -1):
+        older = '{}.{}.gz'.format(path, index)
+        if os.path.exists(older):
+            os.replace(older, '{}.{}.gz'.format(path, index + 1))
+    with open(path, 'rb+') as reader, open(path + '.1', 'wb') as writer:
+        shutil.copyfileobj(reader, writer, 1 << 20)
+        # output written during the copy, only what lands between this read and the truncate is lost
+        writer.write(reader.read())
+        reader.truncate(0)
+    compress_log(path + '.1')
+
+
+def compress_log(path):
+    with open(path, 'rb') as reader, gzip.open(path + '.gz', 'wb', compresslevel=6) as writer:
+        shutil.copyfileobj(reader, writer, 1 << 20)
+    os.remove(path)
+
+
+async def watch_log(log, process):
+    # Rotate a supervised process log while the process runs
+    while process.returncode is None:
+        await asyncio.sleep(LOG_CHECK)
+        await log.check()
+
+
+def line_time(line, year):
+    match = GETH_TIME.match(line)
+    if match:
+        month, day, hour, minute, second, millis = [int(o) for o in match.groups()]
+        return datetime.datetime(year, month, day, hour, minute, second, millis * 1000).timestamp()
+    match = TESSERA_TIME.match(line)
+    if match:
+        year, month, day, hour, minute, second, millis = [int(o) for o in match.groups()]
+        return datetime.datetime(year, month, day, hour, minute, second, millis * 1000).timestamp()
+    return None
+
+
+class LogFile(object):
+    # Incremental reader of one log. Keeps its file open like `tail -F`: after a rotation the old file is drained
+    # before switching to the new one, the trailing partial line is kept between reads
+
+    def __init__(self, label, path, tail):
+        self.label = label
+        self.path = path
+        self.reader = None
+        self.partial = b''
+        self.time = 0.0
+        self.open(tail)
+
+    def open(self, tail=None):
+        try:
+            self.reader = open(self.path, 'rb')
+        except FileNotFoundError:
+            self.reader = None
+            return
+        self.inode = os.fstat(self.reader.fileno()).st_ino
+        if tail is not None:
+            self.reader.seek(tail_offset(self.reader, tail))
+
+    def read(self):
+        data = b''
+        if self.reader:
+            if os.fstat(self.reader.fileno()).st_size < self.reader.tell():
+                # truncated in place
+                self.reader.seek(0)
+            data = self.reader.read()
+            try:
+                rotated = os.stat(self.path).st_ino != self.inode
+            except FileNotFoundError:
+                rotated = False
+            if rotated:
+                data = data + self.reader.read()
+                self.reader.close()
+                self.reader = None
+        if self.reader is None:
+            self.open()
+            if self.reader:
+                data = data + self.reader.read()
+
+        data = self.partial + data
+        cut = data.rfind(b'\n') + 1
+        self.partial = data[cut:]
+        return data[:cut].decode('utf-8', 'replace').splitlines()
+
+    def timed(self, lines, year):
+        # (time, label, line), lines without a timestamp (stack traces ...) stay with the previous line
+        for line in lines:
+            self.time = line_time(line, year) or self.time
+            yield self.time, self.label, line
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+
+
+def tail_offset(reader, lines):
+    # Offset where the last `lines` lines start, the file is read backwards in blocks
+    end = reader.seek(0, os.SEEK_END)
+    if lines <= 0:
+        return end
+    position = end
+    found = 0
+    while position > 0:
+        step = min(1 << 16, position)
+        position = position - step
+        reader.seek(position)
+        block = reader.read(step)
+        index = len(block)
+        while True:
+            index = block.rfind(b'\n', 0, index)
+            if index < 0:
+                break
+            # the newline ending the last line does not start a line
+            if position + index < end - 1:
+                found = found + 1
+                if found == lines:
+                    return position + index + 1
+    return 0
+
+
+class Inotify(object):
+    # Minimal inotify binding over ctypes, watches directories for modified and newly created files
+
+    def __init__(self, directories):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.watches = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, directory.encode(), IN_MODIFY | IN_CREATE | IN_MOVED_TO)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), 'inotify_add_watch {}'.format(directory))
+            self.watches[wd] = directory
+
+    def wait(self, timeout):
+        # Paths changed since the last call, empty on timeout
+        import select
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        data = os.read(self.fd, 1 << 16)
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, cookie, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\0').decode()
+            offset = offset + 16 + length
+            if wd in self.watches:
+                changed.add(os.path.join(self.watches[wd], name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def follow_logs(files, pattern=None, tail=10, follow=True, out=sys.stdout):
+    # Tail every (label, path) at once, merge lines by timestamp and keep following with inotify (polling when
+    # unavailable). pattern filters lines
+    logs = [LogFile(label, path, tail) for label, path in files]
+    byPath = {o.path: o for o in logs}
+    year = datetime.datetime.now().year
+    width = max([len(o.label) for o in logs] or [0])
+
+    def emit(changed):
+        merged = heapq.merge(*[list(o.timed(o.read(), year)) for o in changed], key=lambda o: o[0])
+        for stamp, label, line in merged:
+            if pattern is None or pattern.search(line):
+                out.write('{} | {}\n'.format(label.ljust(width), line))
+        out.flush()
+
+    emit(logs)
+    if not follow:
+        return
+
+    try:
+        watcher = Inotify(sorted(set([os.path.dirname(o.path) for o in logs])))
+    except (OSError, AttributeError):
+        watcher = None
+    try:
+        while True:
+            if watcher:
+                changed = [byPath[o] for o in watcher.wait(1.0) if o in byPath]
+            else:
+                time.sleep(FOLLOW_POLL)
+                changed = logs
+            if changed:
+                emit(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher:
+            watcher.close()
+        for log in logs:
+            log.close()
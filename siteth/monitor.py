@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from siteth.rpc import rpc_session, rpc_batch
+from siteth.workspace import read_processes
+
+# Columns of each node sample in the monitor time series
+MONITOR_FIELDS = ('height', 'peers', 'pending', 'queued', 'role', 'leader', 'geth_cpu', 'geth_rss', 'tessera_cpu',
+                  'tessera_rss')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def process_usage(pid):
+    # (cpu seconds, rss bytes) from /proc, None where /proc is not available
+    try:
+        with open('/proc/{}/stat'.format(pid), 'r') as reader:
+            # fields after the command name, which may contain spaces
+            fields = reader.read().rsplit(')', 1)[1].split()
+        with open('/proc/{}/statm'.format(pid), 'r') as reader:
+            resident = int(reader.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / float(CLOCK_TICKS), resident * PAGE_SIZE
+
+
+def node_calls(consensus):
+    calls = [('eth_blockNumber', []), ('net_peerCount', []), ('txpool_status', [])]
+    if consensus == 'raft':
+        return calls + [('raft_role', []), ('raft_leader', [])]
+    return calls + [('istanbul_nodeAddress', []), ('istanbul_getValidators', ['latest'])]
+
+
+def sample_node(session, port, consensus, timeout):
+    # One batched request per node and interval keeps the polling cost to a single HTTP round trip
+    try:
+        height, peers, txpool, first, second = [o.get('result') for o in rpc_batch(
+            session, port, node_calls(consensus), timeout)]
+    except Exception:
+        return None
+    txpool = txpool or {}
+    sample = [int(height, 16) if height else None, int(peers, 16) if peers else None,
+              int(txpool.get('pending', '0x0'), 16), int(txpool.get('queued', '0x0'), 16)]
+    if consensus == 'raft':
+        return sample + [first, second]
+    validators = [o.lower() for o in (second or [])]
+    return sample + ['validator' if first and first.lower() in validators else 'observer', None]
+
+
+class Monitor(object):
+    # Samples every node at a fixed interval, appends one JSON line per interval to net-info/monitor/<start>.jsonl
+
+    def __init__(self, workspace, ports, consensus, enodes, timeout=5):
+        # ports: {node: rpc port}
+        self.workspace = workspace
+        self.nodes = sorted(ports)
+        self.ports = dict(ports)
+        self.consensus = consensus
+        # raft_leader answers with an enode id, map it back to a node number
+        self.enodes = enodes
+        self.timeout = timeout
+        self.session = rpc_session(max(1, len(self.nodes)))
+        self.pool = ThreadPoolExecutor(max_workers=max(1, min(len(self.nodes), 32)))
+        self.usage = {}
+
+    def process_samples(self, now):
+        # {name: (cpu %, rss bytes)} of the supervised geth/Tessera processes since the previous sample
+        samples = {}
+        for name, process in read_processes(self.workspace).items():
+            if not process.get('pid') or process.get('status') != 'running':
+                continue
+            usage = process_usage(process['pid'])
+            if usage is None:
+                continue
+            previous = self.usage.get(name)
+            self.usage[name] = (now, process['pid'], usage[0])
+            cpu = None
+            if previous and previous[1] == process['pid'] and now > previous[0]:
+                cpu = round(100.0 * (usage[0] - previous[2]) / (now - previous[0]), 1)
+            samples[name] = (cpu, usage[1])
+        return samples
+
+    def sample(self):
+        now = time.time()
+        results = self.pool.map(lambda node: sample_node(self.session, self.ports[node], self.consensus, self.timeout),
+                                self.nodes)
+        processes = self.process_samples(now)
+        nodes = {}
+        for node, sample in zip(self.nodes, results):
+            sample = sample or [None] * 6
+            if self.consensus == 'raft' and sample[5]:
+                sample[5] = self.enodes.get(sample[5].replace('0x', ''), sample[5])
+            geth = processes.get('geth-{}'.format(node), (None, None))
+            tessera = processes.get('tessera-{}'.format(node), (None, None))
+            nodes[node] = sample + list(geth) + list(tessera)
+        return now, nodes
+
+    def run(self, interval=1.0, count=0, out=sys.stdout):
+        folder = os.path.join(self.workspace, 'net-info', 'monitor')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, '{}.jsonl'.format(time.strftime('%Y-%m-%d-%H-%M-%S')))
+        logging.info("Monitoring {} nodes every {}s into {}".format(len(self.nodes), interval, path))
+        started = time.time()
+        samples = 0
+        try:
+            with open(path, 'w') as writer:
+                writer.write(json.dumps({'fields': MONITOR_FIELDS, 'consensus': self.consensus,
+                                         'nodes': self.nodes, 'interval': interval}) + '\n')
+                while not count or samples < count:
+                    now, nodes = self.sample()
+                    writer.write(json.dumps({'t': round(now, 3), 'n': [nodes[o] for o in self.nodes]},
+                                            separators=(',', ':')) + '\n')
+                    writer.flush()
+                    samples = samples + 1
+                    if out.isatty():
+                        out.write(render_table(now, nodes, self.consensus))
+                        out.flush()
+                    # fixed rate: the next sample is due on the interval grid, not after this one finished
+                    time.sleep(max(0.0, started + samples * interval - time.time()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.pool.shutdown()
+            self.session.close()
+        return path
+
+
+def render_table(now, nodes, consensus):
+    # Full screen refresh: cursor home, clear, table
+    heights = [o[0] for o in nodes.values() if o[0] is not None]
+    head = max(heights) if heights else None
+    lines = ['\x1b[H\x1b[2J+ Monitor {} ({}) head:{}'.format(time.strftime('%H:%M:%S', time.localtime(now)),
+                                                             consensus, head),
+             '{:<6} {:>9} {:>5} {:>7} {:>7} {:<10} {:<8} {:>7} {:>9} {:>7} {:>9}'.format(
+                 'node', 'height', 'peers', 'pending', 'queued', 'role', 'leader', 'cpu%', 'rss MB', 'tm cpu%',
+                 'tm rss MB')]
+    cell = lambda value, scale=1: '-' if value is None else value if isinstance(value, str) else \
+        '{:.0f}'.format(value / scale) if scale != 1 else value
+    for node in sorted(nodes):
+        height, peers, pending, queued, role, leader, cpu, rss, tmCpu, tmRss = nodes[node]
+        lag = '' if height is None or head is None or height == head else '(-{})'.format(head - height)
+        lines.append('{:<6} {:>9} {:>5} {:>7} {:>7} {:<10} {:<8} {:>7} {:>9} {:>7} {:>9}'.format(
+            node, '{}{}'.format(cell(height), lag), cell(peers), cell(pending), cell(queued), cell(role),
+            cell(leader), cell(cpu), cell(rss, 1024 * 1024), cell(tmCpu), cell(tmRss, 1024 * 1024)))
+    return '\n'.join(lines) + '\n'
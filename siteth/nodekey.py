@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+# secp256k1 curve parameters, used to derive node identities without calling bootnode
+SECP256K1_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+               0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+
+
+def secp256k1_double(point):
+    # Jacobian point doubling (a = 0)
+    x, y, z = point
+    if not y:
+        return (0, 0, 0)
+    p = SECP256K1_P
+    ysq = (y * y) % p
+    s = (4 * x * ysq) % p
+    m = (3 * x * x) % p
+    nx = (m * m - 2 * s) % p
+    ny = (m * (s - nx) - 8 * ysq * ysq) % p
+    nz = (2 * y * z) % p
+    return (nx, ny, nz)
+
+
+def secp256k1_add(p1, p2):
+    # Jacobian point addition
+    if not p1[1]:
+        return p2
+    if not p2[1]:
+        return p1
+    p = SECP256K1_P
+    x1, y1, z1 = p1
+    x2, y2, z2 = p2
+    z1sq, z2sq = (z1 * z1) % p, (z2 * z2) % p
+    u1, u2 = (x1 * z2sq) % p, (x2 * z1sq) % p
+    s1, s2 = (y1 * z2sq * z2) % p, (y2 * z1sq * z1) % p
+    if u1 == u2:
+        return secp256k1_double(p1) if s1 == s2 else (0, 0, 1)
+    h, r = u2 - u1, s2 - s1
+    hsq = (h * h) % p
+    hcu = (hsq * h) % p
+    nx = (r * r - hcu - 2 * u1 * hsq) % p
+    ny = (r * (u1 * hsq - nx) - s1 * hcu) % p
+    nz = (h * z1 * z2) % p
+    return (nx, ny, nz)
+
+
+def secp256k1_public_key(private_key):
+    # Uncompressed public key without the 0x04 prefix, same as bootnode --writeaddress
+    result = (0, 0, 1)
+    addend = (SECP256K1_G[0], SECP256K1_G[1], 1)
+    while private_key:
+        if private_key & 1:
+            result = secp256k1_add(result, addend)
+        addend = secp256k1_double(addend)
+        private_key >>= 1
+    x, y, z = result
+    zinv = pow(z, SECP256K1_P - 2, SECP256K1_P)
+    x = (x * zinv * zinv) % SECP256K1_P
+    y = (y * zinv * zinv * zinv) % SECP256K1_P
+    return x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+
+
+def generate_node_keys(workspace, size):
+    # Writes node-N/nodekey and node-N/enode byte-compatible with bootnode --genkey / --writeaddress
+    enodes = []
+    for node in range(1, size + 1):
+        privateKey = 0
+        while not 0 < privateKey < SECP256K1_N:
+            privateKey = int.from_bytes(os.urandom(32), 'big')
+        enode = secp256k1_public_key(privateKey).hex()
+
+        nodepath = os.path.join(workspace, 'node-{}'.format(node))
+        with open(os.path.join(nodepath, 'nodekey'), 'w') as keyWriter:
+            keyWriter.write(privateKey.to_bytes(32, 'big').hex())
+        os.chmod(os.path.join(nodepath, 'nodekey'), 0o600)
+        with open(os.path.join(nodepath, 'enode'), 'w') as enodeWriter:
+            enodeWriter.write('{}\n'.format(enode))
+        enodes.append(enode)
+    return enodes
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import struct
+
+# Link layer header parsers, return (ip offset, ip version) of a captured frame or None
+PCAP_MAGIC = {b'\xd4\xc3\xb2\xa1': '<', b'\xa1\xb2\xc3\xd4': '>',
+              b'\x4d\x3c\xb2\xa1': '<', b'\xa1\xb2\x3c\x4d': '>'}
+ETHERTYPES = {0x0800: 4, 0x86DD: 6}
+
+
+def link_null(frame):
+    # BSD loopback, address family in host byte order
+    if len(frame) < 4:
+        return None
+    family = struct.unpack('<I', frame[:4])[0]
+    if family > 0xFFFF:
+        family = struct.unpack('>I', frame[:4])[0]
+    return (4, 4) if family == 2 else (4, 6) if family in (10, 24, 28, 30) else None
+
+
+def link_ethernet(frame):
+    offset = 12
+    while len(frame) >= offset + 2:
+        ethertype = struct.unpack('>H', frame[offset:offset + 2])[0]
+        if ethertype in (0x8100, 0x88A8):
+            offset = offset + 4
+            continue
+        return (offset + 2, ETHERTYPES[ethertype]) if ethertype in ETHERTYPES else None
+    return None
+
+
+def link_raw(frame):
+    return (0, frame[0] >> 4) if frame and frame[0] >> 4 in (4, 6) else None
+
+
+def link_sll(frame):
+    if len(frame) < 16:
+        return None
+    protocol = struct.unpack('>H', frame[14:16])[0]
+    return (16, ETHERTYPES[protocol]) if protocol in ETHERTYPES else None
+
+
+def link_sll2(frame):
+    if len(frame) < 20:
+        return None
+    protocol = struct.unpack('>H', frame[0:2])[0]
+    return (20, ETHERTYPES[protocol]) if protocol in ETHERTYPES else None
+
+
+LINKTYPES = {0: link_null, 1: link_ethernet, 101: link_raw, 113: link_sll, 276: link_sll2}
+
+
+def tcp_ports(frame, link):
+    # (source port, destination port) of a TCP frame, None for anything else
+    ip = link(frame)
+    if ip is None:
+        return None
+    offset, version = ip
+    if version == 4:
+        if len(frame) < offset + 20 or frame[offset + 9] != 6:
+            return None
+        offset = offset + (frame[offset] & 0x0F) * 4
+    else:
+        if len(frame) < offset + 40 or frame[offset + 6] != 6:
+            return None
+        offset = offset + 40
+    if len(frame) < offset + 4:
+        return None
+    return struct.unpack('>HH', frame[offset:offset + 4])
+
+
+def read_pcap(path):
+    # Yield (header bytes, record header bytes, frame bytes, linktype), stops quietly on a partial trailing record
+    # so files still being written by tshark can be read
+    with open(path, 'rb') as reader:
+        header = reader.read(24)
+        if len(header) < 24 or header[:4] not in PCAP_MAGIC:
+            raise RuntimeError("{} is not a pcap file".format(path))
+        order = PCAP_MAGIC[header[:4]]
+        linktype = struct.unpack(order + 'I', header[20:24])[0] & 0x0FFFFFFF
+        while True:
+            record = reader.read(16)
+            if len(record) < 16:
+                return
+            length = struct.unpack(order + 'I', record[8:12])[0]
+            frame = reader.read(length)
+            if len(frame) < length:
+                return
+            yield header, record, frame, linktype
+
+
+def ring_files(folder, prefix='capture'):
+    # tshark ring buffer files <prefix>_<sequence>_<timestamp>.pcap in capture order
+    pattern = re.compile(r'^{}_(\d+)_\d+\.pcap$'.format(re.escape(prefix)))
+    files = [(int(pattern.match(o).group(1)), o) for o in os.listdir(folder) if pattern.match(o)]
+    return [os.path.join(folder, o) for _, o in sorted(files)]
+
+
+def split_pcap(paths, targets, output):
+    # Demultiplex frames by TCP destination port. targets: {port: relative output path}, returns frames per output
+    writers = {}
+    counts = {}
+    try:
+        for path in paths:
+            for header, record, frame, linktype in read_pcap(path):
+                if linktype not in LINKTYPES:
+                    raise RuntimeError("Unsupported pcap link type {} in {}".format(linktype, path))
+                ports = tcp_ports(frame, LINKTYPES[linktype])
+                if ports is None or ports[1] not in targets:
+                    continue
+                target = targets[ports[1]]
+                if target not in writers:
+                    os.makedirs(os.path.dirname(os.path.join(output, target)), exist_ok=True)
+                    writers[target] = open(os.path.join(output, target), 'wb')
+                    writers[target].write(header)
+                writers[target].write(record)
+                writers[target].write(frame)
+                counts[target] = counts.get(target, 0) + 1
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return counts
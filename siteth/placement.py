@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import logging
+import resource
+
+# CPU placement & resource limits of the supervised geth/Tessera processes, the plan of the last --run is kept in
+# net-info/placement.json and reused by the next runs so benchmarks run on the same cores
+CPU_PERIOD = 100000
+
+
+def parse_cpus(cpus):
+    # "0-3,6" -> [0, 1, 2, 3, 6]
+    selected = set()
+    for entry in [o.strip() for o in str(cpus).split(',') if o.strip()]:
+        first, _, last = entry.partition('-')
+        selected.update(range(int(first), int(last or first) + 1))
+    return sorted(selected)
+
+
+def format_cpus(cpus):
+    # [0, 1, 2, 3, 6] -> "0-3,6"
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(['{}-{}'.format(a, b) if a != b else str(a) for a, b in ranges])
+
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_pins(pins):
+    # "1:0-1;3:4" -> {1: [0, 1], 3: [4]}, the node geth & Tessera share the set
+    pinned = {}
+    for entry in [o.strip() for o in (pins or '').split(';') if o.strip()]:
+        node, _, cpus = entry.partition(':')
+        if not cpus:
+            raise RuntimeError("Invalid pin {}, expected NODE:CPUS (ex, 1:0-1;2:2)".format(entry))
+        pinned[int(node)] = parse_cpus(cpus)
+    return pinned
+
+
+def plan_placement(names, cpus, per_process=1, pinned=None, memory=None, cpu=None):
+    # {process name: {'cpus', 'memory', 'cpu'}}. Pinned nodes get their CPU set, the other processes are laid out
+    # round robin, per_process CPUs each, on the CPUs nobody pinned (all of them if every CPU is pinned)
+    pinned = pinned or {}
+    reserved = set([o for node in pinned.values() for o in node])
+    unknown = reserved.difference(cpus)
+    if unknown:
+        raise RuntimeError("CPUs {} are not available, use {}".format(format_cpus(unknown), format_cpus(cpus)))
+    pool = [o for o in cpus if o not in reserved] or list(cpus)
+    per_process = max(1, min(per_process, len(pool)))
+
+    plan = {}
+    position = 0
+    for name in names:
+        node = int(name.rsplit('-', 1)[1])
+        if node in pinned:
+            selected = pinned[node]
+        else:
+            selected = sorted(set([pool[(position + o) % len(pool)] for o in range(per_process)]))
+            position = position + per_process
+        plan[name] = {'cpus': selected, 'memory': memory, 'cpu': cpu}
+    return plan
+
+
+def write_placement(workspace, plan):
+    path = os.path.join(workspace, 'net-info', 'placement.json')
+    with open(path + '.tmp', 'w') as writer:
+        json.dump({'cpus': available_cpus(), 'processes': plan}, writer, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def read_placement(workspace):
+    path = os.path.join(workspace, 'net-info', 'placement.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as reader:
+        return json.load(reader)['processes']
+
+
+def remove_placement(workspace):
+    path = os.path.join(workspace, 'net-info', 'placement.json')
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def describe_placement(placement):
+    # "cpus:0-1 memory:512MB cpu:1.5 (cgroup)"
+    if not placement:
+        return 'unpinned'
+    fields = ['cpus:{}'.format(format_cpus(placement['cpus']))] if placement.get('cpus') else []
+    if placement.get('memory'):
+        fields.append('memory:{}MB'.format(placement['memory']))
+    if placement.get('cpu'):
+        fields.append('cpu:{}'.format(placement['cpu']))
+    if placement.get('method'):
+        fields.append('({})'.format(placement['method']))
+    return ' '.join(fields)
+
+
+def cgroup_base():
+    # cgroup v2 directory of this process, None without a cgroup2 mount
+    mount = None
+    with open('/proc/self/mounts', 'r') as reader:
+        for line in reader:
+            fields = line.split()
+            if fields[2] == 'cgroup2':
+                mount = fields[1]
+                break
+    if mount is None:
+        return None
+    with open('/proc/self/cgroup', 'r') as reader:
+        for line in reader:
+            if line.startswith('0::'):
+                return os.path.join(mount, line.strip()[3:].lstrip('/'))
+    return None
+
+
+def write_control(path, value):
+    with open(path, 'w') as writer:
+        writer.write(value)
+
+
+def prepare_cgroup(workspace, name, memory=None, cpu=None):
+    # Leaf cgroup <supervisor cgroup>/siteth-<workspace hash>/<name> with memory.max & cpu.max set, returns its
+    # cgroup.procs. Raises OSError where cgroups v2 is missing or not delegated to this user
+    base = cgroup_base()
+    if base is None:
+        raise OSError("no cgroup2 hierarchy")
+    controllers = [o for o, value in (('memory', memory), ('cpu', cpu)) if value]
+    with open(os.path.join(base, 'cgroup.subtree_control'), 'r') as reader:
+        enabled = reader.read().split()
+    missing = [o for o in controllers if o not in enabled]
+    if missing:
+        # refused (EBUSY) when the base cgroup holds processes and is not the root, e.g. a login session scope
+        write_control(os.path.join(base, 'cgroup.subtree_control'), ' '.join(['+' + o for o in missing]))
+    group = os.path.join(base, 'siteth-{}'.format(hashlib.sha1(workspace.encode('utf-8')).hexdigest()[:10]))
+    os.makedirs(group, exist_ok=True)
+    write_control(os.path.join(group, 'cgroup.subtree_control'), ' '.join(['+' + o for o in controllers]))
+    leaf = os.path.join(group, name)
+    os.makedirs(leaf, exist_ok=True)
+    if memory:
+        write_control(os.path.join(leaf, 'memory.max'), str(int(memory * 1024 * 1024)))
+    if cpu:
+        write_control(os.path.join(leaf, 'cpu.max'), '{} {}'.format(int(cpu * CPU_PERIOD), CPU_PERIOD))
+    return os.path.join(leaf, 'cgroup.procs')
+
+
+def remove_cgroup(procs):
+    try:
+        os.rmdir(os.path.dirname(procs))
+    except OSError:
+        pass
+
+
+def placement_hook(cpus=None, procs=None, memory=None):
+    # Runs in the child between fork & exec so every thread geth or the JVM creates inherits the placement.
+    # Without a cgroup the memory limit falls back on RLIMIT_AS (address space, larger than RSS)
+    def hook():
+        if procs:
+            write_control(procs, '0')
+        elif memory:
+            limit = int(memory * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cpus)
+    return hook
+
+
+def apply_placement(workspace, name, placement, command=''):
+    # (preexec hook, cgroup.procs or None, method) for one process placement. A JVM can't start under RLIMIT_AS,
+    # its memory is capped by the caller on the java command line (-XX:MaxRAM)
+    if not placement:
+        return None, None, None
+    procs = None
+    memory = placement.get('memory')
+    method = 'affinity' if placement.get('cpus') else None
+    if memory or placement.get('cpu'):
+        try:
+            procs = prepare_cgroup(workspace, name, memory, placement.get('cpu'))
+            method = 'cgroup'
+        except OSError as e:
+            if memory and os.path.basename(command.split(' ', 1)[0]) == 'java':
+                memory = None
+                fallback = 'memory capped by -XX:MaxRAM only, no CPU quota'
+                method = 'jvm'
+            elif memory:
+                fallback = 'memory capped with prlimit, no CPU quota'
+                method = 'prlimit'
+            else:
+                fallback = 'no CPU quota'
+            logging.warning("{} cgroup v2 limits unavailable ({}), {}".format(name, e, fallback))
+    return placement_hook(placement.get('cpus'), procs, memory), procs, method
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from siteth.ipc import IPCClient
+
+
+def enode_id(enode):
+    return enode.replace('enode://', '').split('@')[0]
+
+
+def raft_members(client):
+    return set([o.get('nodeId') or enode_id(o.get('enode', '')) for o in client.call('raft_cluster')])
+
+
+def raft_peer_node(workspace, node, staticNodes, timeout=60):
+    # Add every missing static node to this node raft cluster in one batch, then verify membership
+    client = IPCClient(os.path.join(workspace, 'node-{}'.format(node), 'geth.ipc'), timeout)
+    try:
+        members = raft_members(client)
+        missing = [peer for peer in staticNodes if enode_id(peer) not in members]
+        errors = {}
+        for peer, response in zip(missing, client.batch([('raft_addPeer', [peer]) for peer in missing])):
+            if 'error' in response:
+                errors[enode_id(peer)] = response['error'].get('message')
+        members = raft_members(client)
+        return [peer for peer in staticNodes if enode_id(peer) not in members], errors
+    finally:
+        client.close()
+
+
+def raft_peering(workspace, staticNodes, skip=(), timeout=60):
+    nodes = [node for node in range(1, len(staticNodes) + 1) if str(node) not in skip]
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, min(len(nodes), 32))) as pool:
+        futures = {pool.submit(raft_peer_node, workspace, node, staticNodes, timeout): node for node in nodes}
+        for future in as_completed(futures):
+            node = futures[future]
+            try:
+                missing, errors = future.result()
+            except Exception as e:
+                logging.error("node-{} raft peering failed: {}".format(node, e))
+                failed = True
+                continue
+            for peer in missing:
+                failed = True
+                logging.error("node-{} raft cluster is missing {} {}".format(
+                    node, enode_id(peer), errors.get(enode_id(peer), '')))
+            if not missing:
+                logging.info("node-{} raft cluster complete ({} members)".format(node, len(staticNodes)))
+    if failed:
+        logging.error("Raft infrastructure is incomplete")
+    else:
+        logging.info("Raft infrastructure was successfully bootstrapped")
+    return not failed
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import time
+import requests
+
+
+def rpc_session(size=10):
+    # Pooled keep-alive HTTP session shared by concurrent JSON-RPC calls
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    session.mount('http://', adapter)
+    return session
+
+
+def rpc_batch(session, port, calls, timeout=60):
+    # calls: [(method, params)], returns responses in the same order
+    payload = [{'jsonrpc': '2.0', 'id': index, 'method': method, 'params': params}
+               for index, (method, params) in enumerate(calls)]
+    result = session.post('http://127.0.0.1:{}'.format(port), json=payload, timeout=timeout).json()
+    responses = {o.get('id'): o for o in (result if isinstance(result, list) else [result])}
+    return [responses.get(o['id'], {'error': {'message': 'missing response'}}) for o in payload]
+
+
+def rpc_call(session, port, method, params=None, timeout=60):
+    response = rpc_batch(session, port, [(method, params or [])], timeout)[0]
+    if 'error' in response:
+        raise RuntimeError("{}: {}".format(method, response['error'].get('message')))
+    return response.get('result')
+
+
+def wait_rpc(session, port, timeout=60):
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return rpc_call(session, port, 'web3_clientVersion', timeout=5)
+        except requests.exceptions.ConnectionError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.2)
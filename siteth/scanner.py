@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from siteth.rpc import rpc_session, rpc_batch, rpc_call
+
+
+def fetch_blocks(session, port, start, end, timeout=60):
+    responses = rpc_batch(session, port, [('eth_getBlockByNumber', [hex(number), True])
+                                          for number in range(start, end + 1)], timeout)
+    for number, response in zip(range(start, end + 1), responses):
+        if 'error' in response:
+            raise RuntimeError("block {}: {}".format(number, response['error'].get('message')))
+    return [o.get('result') for o in responses]
+
+
+def scan_blocks(session, port, start, end, batch=100, inflight=4):
+    # Yield blocks in order while keeping `inflight` batched eth_getBlockByNumber requests running
+    ranges = [(o, min(o + batch - 1, end)) for o in range(start, end + 1, batch)]
+    with ThreadPoolExecutor(max_workers=max(1, inflight)) as pool:
+        pending = [pool.submit(fetch_blocks, session, port, o[0], o[1]) for o in ranges[:inflight]]
+        ranges = ranges[inflight:]
+        while pending:
+            blocks = pending.pop(0).result()
+            if ranges:
+                pending.append(pool.submit(fetch_blocks, session, port, ranges[0][0], ranges[0][1]))
+                ranges = ranges[1:]
+            for block in blocks:
+                if block:
+                    yield block
+
+
+def scan_transactions(port, account, contracts_only=False, start=0, end=None, batch=100, inflight=4):
+    # Stream matching transactions as JSONL, `*` matches every account
+    session = rpc_session(max(1, inflight))
+    if end is None:
+        end = int(rpc_call(session, port, 'eth_blockNumber'), 16)
+    account = account.lower()
+    logging.info("Scanning blocks {} to {} for {}".format(start, end, account))
+    matched = 0
+    scanned = start - 1
+    try:
+        for block in scan_blocks(session, port, start, end, batch, inflight):
+            for tx in block.get('transactions', []):
+                if contracts_only and tx.get('to'):
+                    continue
+                if account == '*' or account in ((tx.get('from') or '').lower(), (tx.get('to') or '').lower()):
+                    tx['timestamp'] = int(block['timestamp'], 16)
+                    sys.stdout.write(json.dumps(tx) + '\n')
+                    matched = matched + 1
+            scanned = int(block['number'], 16)
+        sys.stdout.flush()
+    except KeyboardInterrupt:
+        sys.stdout.flush()
+        logging.warning("Scan interrupted after block {}, resume with --fromBlock {}".format(scanned, scanned + 1))
+    finally:
+        session.close()
+    logging.info("Total Transactions: {}".format(matched))
+    return matched
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import glob
+import shutil
+import logging
+from collections import Counter
+
+# Per node chain state captured by a snapshot, relative to node-N
+SNAPSHOT_PATHS = ('geth', 'quorum-raft-state', 'raft-snap', 'raft-wal')
+# linux/fs.h FICLONE, share extents copy-on-write (btrfs, xfs, bcachefs ...)
+FICLONE = 0x40049409
+
+
+def snapshot_path(workspace, name):
+    snapshots = os.path.join(workspace, 'net-info', 'snapshots')
+    path = os.path.normpath(os.path.join(snapshots, name))
+    # the path is removed & replaced, it must be a direct child of net-info/snapshots
+    if os.path.dirname(path) != os.path.normpath(snapshots):
+        raise RuntimeError("Invalid snapshot name {}".format(name))
+    return path
+
+
+def clone_file(source, target, methods):
+    # reflink, then hardlink for immutable LevelDB tables, then copy. Unsupported methods are dropped from methods
+    if 'reflink' in methods:
+        try:
+            import fcntl
+            with open(source, 'rb') as reader, open(target, 'wb') as writer:
+                fcntl.ioctl(writer.fileno(), FICLONE, reader.fileno())
+            shutil.copystat(source, target)
+            return 'reflink'
+        except (ImportError, OSError):
+            methods.discard('reflink')
+            if os.path.exists(target):
+                os.remove(target)
+
+    # *.ldb files are never modified once written, every other LevelDB file (MANIFEST, LOG, *.log) is
+    if 'hardlink' in methods and source.endswith('.ldb'):
+        try:
+            os.link(source, target)
+            return 'hardlink'
+        except OSError:
+            methods.discard('hardlink')
+
+    shutil.copy2(source, target)
+    return 'copy'
+
+
+def clone_tree(source, target, methods):
+    used = Counter()
+    for root, dirs, files in os.walk(source):
+        destination = os.path.join(target, os.path.relpath(root, source))
+        os.makedirs(destination, exist_ok=True)
+        for name in files:
+            # skip LOCK files & sockets, geth recreates them
+            if name == 'LOCK' or not os.path.isfile(os.path.join(root, name)):
+                continue
+            used[clone_file(os.path.join(root, name), os.path.join(destination, name), methods)] += 1
+    return used
+
+
+def node_tessera_stores(workspace, node):
+    return glob.glob(os.path.join(workspace, 'net-info', 'tessera', 'node-{}-tx'.format(node), 'tessera-store-*'))
+
+
+def take_snapshot(workspace, name, nodes, tessera=False):
+    # Capture chain state of nodes (and optionally Tessera stores & the index) under net-info/snapshots/name
+    nodes = list(nodes)
+    started = time.time()
+    target = snapshot_path(workspace, name)
+    partial = target + '.tmp'
+    shutil.rmtree(partial, ignore_errors=True)
+
+    methods = set(['reflink', 'hardlink'])
+    used = Counter()
+    for node in nodes:
+        for path in SNAPSHOT_PATHS:
+            source = os.path.join(workspace, 'node-{}'.format(node), path)
+            if os.path.isdir(source):
+                used.update(clone_tree(source, os.path.join(partial, 'node-{}'.format(node), path), methods))
+        if tessera:
+            for store in node_tessera_stores(workspace, node):
+                os.makedirs(os.path.join(partial, 'tessera', 'node-{}-tx'.format(node)), exist_ok=True)
+                used[clone_file(store, os.path.join(partial, 'tessera', 'node-{}-tx'.format(node),
+                                                    os.path.basename(store)), methods)] += 1
+    index = os.path.join(workspace, 'net-info', 'index.sqlite')
+    if tessera and os.path.exists(index):
+        used[clone_file(index, os.path.join(partial, 'index.sqlite'), methods)] += 1
+
+    with open(os.path.join(partial, 'snapshot.json'), 'w') as writer:
+        json.dump({'nodes': nodes, 'tessera': tessera, 'created': time.time()}, writer)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(partial, target)
+    logging.info("Snapshot {} taken in {:.2f}s ({})".format(
+        name, time.time() - started, ', '.join(['{} {}'.format(v, k) for k, v in sorted(used.items())]) or 'empty'))
+
+
+def restore_snapshot(workspace, name):
+    # Replace chain state of the snapshot nodes with the snapshot content
+    source = snapshot_path(workspace, name)
+    if not os.path.exists(os.path.join(source, 'snapshot.json')):
+        raise RuntimeError("Snapshot {} can't be found".format(name))
+    with open(os.path.join(source, 'snapshot.json'), 'r') as reader:
+        snapshot = json.load(reader)
+
+    started = time.time()
+    methods = set(['reflink', 'hardlink'])
+    used = Counter()
+    for node in snapshot['nodes']:
+        for path in SNAPSHOT_PATHS:
+            target = os.path.join(workspace, 'node-{}'.format(node), path)
+            shutil.rmtree(target, ignore_errors=True)
+            if os.path.isdir(os.path.join(source, 'node-{}'.format(node), path)):
+                used.update(clone_tree(os.path.join(source, 'node-{}'.format(node), path), target, methods))
+        if snapshot['tessera']:
+            for store in node_tessera_stores(workspace, node):
+                os.remove(store)
+            stores = os.path.join(source, 'tessera', 'node-{}-tx'.format(node))
+            if os.path.isdir(stores):
+                for store in os.listdir(stores):
+                    used[clone_file(os.path.join(stores, store), os.path.join(
+                        workspace, 'net-info', 'tessera', 'node-{}-tx'.format(node), store), methods)] += 1
+
+    # the index must match the restored chain, keep the snapshot copy or let it rebuild
+    index = os.path.join(workspace, 'net-info', 'index.sqlite')
+    if os.path.exists(index):
+        os.remove(index)
+    if os.path.exists(os.path.join(source, 'index.sqlite')):
+        used[clone_file(os.path.join(source, 'index.sqlite'), index, methods)] += 1
+
+    logging.info("Snapshot {} restored in {:.2f}s ({})".format(
+        name, time.time() - started, ', '.join(['{} {}'.format(v, k) for k, v in sorted(used.items())]) or 'empty'))
+    return snapshot['nodes']
+
+
+def list_snapshots(workspace):
+    snapshots = os.path.join(workspace, 'net-info', 'snapshots')
+    if not os.path.isdir(snapshots):
+        return []
+    return sorted([o for o in os.listdir(snapshots) if os.path.exists(os.path.join(snapshots, o, 'snapshot.json'))])
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+
+IMPORT_PATTERN = re.compile(r'''^\s*import\s+(?:[^'"]*?\s+from\s+)?["']([^"']+)["']''', re.MULTILINE)
+CONTRACT_PATTERN = re.compile(r'^\s*(?:abstract\s+)?contract\s+(\w+)', re.MULTILINE)
+
+
+def solc_version(cache):
+    # `solcjs --version` costs a node startup, remember it per solcjs binary (path, size, mtime)
+    solcjs = shutil.which('solcjs')
+    if not solcjs:
+        raise RuntimeError("solcjs can't be found, install it with npm install -g solc")
+    stat = os.stat(os.path.realpath(solcjs))
+    binary = '{}:{}:{}'.format(os.path.realpath(solcjs), stat.st_size, stat.st_mtime)
+
+    versions = {}
+    if os.path.exists(os.path.join(cache, 'versions.json')):
+        with open(os.path.join(cache, 'versions.json'), 'r') as reader:
+            versions = json.load(reader)
+    if binary not in versions:
+        versions[binary] = subprocess.run(['solcjs', '--version'], stdout=subprocess.PIPE,
+                                          universal_newlines=True).stdout.strip()
+        with open(os.path.join(cache, 'versions.json'), 'w') as writer:
+            json.dump(versions, writer)
+    return versions[binary]
+
+
+def source_digest(source, digest, seen):
+    # Hash the source and every file it imports, relative imports resolve against the importing file
+    path = os.path.abspath(source)
+    if path in seen:
+        return
+    seen.add(path)
+    digest.update(path.encode())
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as reader:
+        content = reader.read()
+    digest.update(content)
+    for target in IMPORT_PATTERN.findall(content.decode('utf-8', 'replace')):
+        if target.startswith('.'):
+            target = os.path.join(os.path.dirname(path), target)
+        source_digest(target, digest, seen)
+
+
+def solc_compile(source, output):
+    # Compile with solcjs, returns {contract name: output file prefix} for contracts defined in source
+    process = subprocess.run(['solcjs', '--bin', '--abi', source, '--output-dir', output],
+                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    if process.returncode != 0:
+        for line in process.stdout.strip().splitlines()[-10:]:
+            logging.error("solcjs: {}".format(line))
+        raise RuntimeError("Compilation of {} failed with exit code {}".format(source, process.returncode))
+
+    # solcjs names outputs <source path with [:./\] replaced by _>_<contract>
+    prefix = re.sub(r'[:./\\]', '_', source) + '_'
+    contracts = {}
+    for name in os.listdir(output):
+        if name.startswith(prefix) and name.endswith('.bin'):
+            contracts[name[len(prefix):-len('.bin')]] = os.path.join(output, name[:-len('.bin')])
+    if not contracts:
+        # other solcjs releases shorten the path part, keep what follows the last _sol_
+        for name in os.listdir(output):
+            if '_sol_' in name and name.endswith('.bin'):
+                contracts[name[:-len('.bin')].split('_sol_')[-1]] = os.path.join(output, name[:-len('.bin')])
+    return contracts
+
+
+def compile_contract(workspace, source, contract_name=None):
+    # Returns (name, abi, bytecode) of a contract in source, compiled at most once per source/imports/compiler
+    cache = os.path.join(workspace, 'net-info', 'solc')
+    os.makedirs(cache, exist_ok=True)
+    digest = hashlib.sha256(solc_version(cache).encode())
+    source_digest(source, digest, set())
+    entry = os.path.join(cache, '{}.json'.format(digest.hexdigest()))
+
+    if os.path.exists(entry):
+        logging.info("Using cached compilation of {}".format(source))
+        with open(entry, 'r') as reader:
+            compiled = json.load(reader)
+    else:
+        logging.info("Compiling contract")
+        output = tempfile.mkdtemp(dir=cache)
+        try:
+            compiled = {}
+            for name, path in solc_compile(source, output).items():
+                with open(path + '.abi', 'r') as abiReader, open(path + '.bin', 'r') as bytecodeReader:
+                    compiled[name] = {'abi': abiReader.read(), 'bin': bytecodeReader.read()}
+        finally:
+            shutil.rmtree(output)
+        with open(entry + '.tmp', 'w') as writer:
+            json.dump(compiled, writer)
+        os.replace(entry + '.tmp', entry)
+
+    if contract_name:
+        if contract_name not in compiled:
+            raise RuntimeError("{} does not define contract {}, available: {}".format(
+                source, contract_name, ', '.join(sorted(compiled))))
+        return contract_name, compiled[contract_name]['abi'], compiled[contract_name]['bin']
+
+    # Default to the contract named after the file, else the last deployable contract declared in the source
+    with open(source, 'r') as reader:
+        declared = [o for o in CONTRACT_PATTERN.findall(reader.read()) if compiled.get(o, {}).get('bin')]
+    stem = os.path.basename(source).split('.')[0]
+    candidates = [stem] if stem in compiled else declared[-1:]
+    if not candidates:
+        raise RuntimeError("No deployable contract found in {}".format(source))
+    if len(declared) > 1:
+        logging.warning("{} defines {}, deploying {}. Use --contractName to choose".format(
+            source, ', '.join(declared), candidates[0]))
+    return candidates[0], compiled[candidates[0]]['abi'], compiled[candidates[0]]['bin']
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import logging
+import subprocess
+
+from siteth.logs import LOG_SIZE, LOG_FILES, RotatingLog, watch_log
+from siteth.placement import apply_placement, remove_cgroup
+from siteth.workspace import read_processes, write_processes
+
+PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+SUPERVISOR_BACKOFF = (1, 30)
+# Seconds between a process start time and the recorded 'started' for the PID to be considered the same process
+START_TOLERANCE = 5
+
+
+class Supervisor(object):
+    # Owns the geth/Tessera/tshark processes of one workspace. Runs detached and is driven over net-info/supervisor.sock
+
+    def __init__(self, workspace, stop_timeout=10):
+        self.workspace = workspace
+        self.stop_timeout = stop_timeout
+        self.specs = {}
+        self.processes = {}
+        self.done = None
+
+    def save(self):
+        write_processes(self.workspace, {name: {key: spec[key] for key in (
+            'pid', 'command', 'log', 'restart', 'restarts', 'status', 'started', 'placement')}
+            for name, spec in self.specs.items()})
+
+    async def spawn(self, name):
+        spec = self.specs[name]
+        env = dict(os.environ)
+        env.update(spec['env'])
+        hook, spec['cgroup'], method = apply_placement(self.workspace, name, spec['placement'], spec['command'])
+        if spec['placement']:
+            spec['placement']['method'] = method
+        # the process appends to its log itself rather than through a pipe, a pipe would kill it (SIGPIPE) once the
+        # supervisor is gone. The supervisor only caps the size
+        log = RotatingLog(spec['log'], spec['log_size'], spec['log_files'])
+        output = log.open()
+        try:
+            process = await asyncio.create_subprocess_shell('exec {}'.format(spec['command']),
+                                                            stdin=subprocess.DEVNULL, stdout=output,
+                                                            stderr=subprocess.STDOUT, env=env,
+                                                            start_new_session=True, preexec_fn=hook)
+        finally:
+            os.close(output)
+        asyncio.ensure_future(watch_log(log, process))
+        self.processes[name] = process
+        spec.update(pid=process.pid, status='running', started=time.time())
+        self.save()
+        logging.info("{} started with pid {}".format(name, process.pid))
+        asyncio.ensure_future(self.watch(name, process))
+        return process.pid
+
+    async def watch(self, name, process):
+        code = await process.wait()
+        spec = self.specs.get(name)
+        if spec is None or self.processes.get(name) is not process or spec['status'] != 'running':
+            return
+        spec['status'] = 'exited({})'.format(code)
+        logging.error("{} (pid {}) exited with code {}".format(name, process.pid, code))
+        if spec['restart'] and not self.done.is_set():
+            # back off exponentially while the process keeps crashing, reset once it stayed up for a minute
+            if time.time() - spec['started'] > 60:
+                spec['backoff'] = SUPERVISOR_BACKOFF[0]
+            else:
+                spec['backoff'] = min(spec.get('backoff', SUPERVISOR_BACKOFF[0] / 2) * 2, SUPERVISOR_BACKOFF[1])
+            spec['restarts'] = spec['restarts'] + 1
+            self.save()
+            logging.info("Restarting {} in {}s".format(name, spec['backoff']))
+            await asyncio.sleep(spec['backoff'])
+            if self.specs.get(name) is spec and spec['status'].startswith('exited') and not self.done.is_set():
+                await self.spawn(name)
+        else:
+            self.save()
+
+    async def terminate(self, name, timeout):
+        # SIGTERM first, SIGKILL once the timeout expires
+        process = self.processes.get(name)
+        self.specs[name]['status'] = 'stopping'
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            logging.warning("{} did not exit after {}s, killing it".format(name, timeout))
+            process.kill()
+            await process.wait()
+
+    async def stop(self, prefixes, timeout):
+        names = [name for name in self.specs if not prefixes or name.startswith(tuple(prefixes))]
+        await asyncio.gather(*[self.terminate(name, timeout) for name in names])
+        for name in names:
+            spec = self.specs.pop(name)
+            if spec.get('cgroup'):
+                remove_cgroup(spec['cgroup'])
+            self.processes.pop(name, None)
+            logging.info("{} stopped".format(name))
+        self.save()
+        return names
+
+    async def start(self, name, command, log, env=None, restart=False, log_size=LOG_SIZE, log_files=LOG_FILES,
+                    placement=None):
+        if name in self.specs:
+            await self.stop([name], self.stop_timeout)
+        self.specs[name] = {'pid': None, 'command': command, 'log': log, 'env': env or {}, 'restart': restart,
+                            'restarts': 0, 'status': 'starting', 'started': None, 'log_size': log_size,
+                            'log_files': log_files, 'placement': placement, 'cgroup': None}
+        return await self.spawn(name)
+
+    async def shutdown(self):
+        await self.stop([], self.stop_timeout)
+        self.done.set()
+
+    async def handle(self, reader, writer):
+        response = {}
+        try:
+            request = json.loads((await reader.readline()).decode('utf-8'))
+            if 'start' in request:
+                response['pid'] = await self.start(**request['start'])
+            if 'stop' in request:
+                response['stopped'] = await self.stop(request['stop'], request.get('timeout', self.stop_timeout))
+            if request.get('shutdown'):
+                await self.shutdown()
+            response['processes'] = read_processes(self.workspace)
+        except Exception as e:
+            response['error'] = str(e)
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+        writer.close()
+
+    async def serve(self):
+        self.done = asyncio.Event()
+        path = os.path.join(self.workspace, 'net-info', 'supervisor.sock')
+        if os.path.exists(path):
+            os.remove(path)
+        server = await asyncio.start_unix_server(self.handle, path=path)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            asyncio.get_event_loop().add_signal_handler(signum, lambda: asyncio.ensure_future(self.shutdown()))
+        logging.info("Supervisor {} serving {}".format(os.getpid(), self.workspace))
+        await self.done.wait()
+        server.close()
+        await server.wait_closed()
+        os.remove(path)
+        logging.info("Supervisor stopped")
+
+
+def supervisor_request(workspace, request, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(os.path.join(workspace, 'net-info', 'supervisor.sock'))
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data = data + chunk
+    response = json.loads(data.decode('utf-8'))
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response
+
+
+def supervisor_running(workspace):
+    try:
+        supervisor_request(workspace, {}, 5)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def ensure_supervisor(workspace, stop_timeout=10):
+    if supervisor_running(workspace):
+        return
+    with open(os.path.join(workspace, 'net-info', 'supervisor.log'), 'ab') as log:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([o for o in (PACKAGE_PATH, env.get('PYTHONPATH')) if o])
+        subprocess.Popen([sys.executable, '-m', 'siteth', '--supervisor', '--workspace', workspace,
+                          '--stopTimeout', str(stop_timeout)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, env=env,
+                         start_new_session=True)
+    deadline = time.time() + 10
+    while not supervisor_running(workspace):
+        if time.time() > deadline:
+            raise RuntimeError("Supervisor did not start, see {}".format(
+                os.path.join(workspace, 'net-info', 'supervisor.log')))
+        time.sleep(0.1)
+
+
+def supervise(workspace, name, command, log, env=None, restart=False, stop_timeout=10, log_size=LOG_SIZE,
+              log_files=LOG_FILES, placement=None):
+    # Start a process under the workspace supervisor, returns its pid. placement: {'cpus', 'memory', 'cpu'}
+    ensure_supervisor(workspace, stop_timeout)
+    return supervisor_request(workspace, {'start': {'name': name, 'command': command, 'log': log, 'env': env,
+                                                    'restart': restart, 'log_size': log_size,
+                                                    'log_files': log_files, 'placement': placement}})['pid']
+
+
+def process_matches(pid, process):
+    # A recorded PID is only signalled while it still runs the recorded command, started when it was recorded.
+    # After a reboot or PID reuse it belongs to an unrelated process
+    try:
+        with open('/proc/{}/cmdline'.format(pid), 'rb') as reader:
+            argv = reader.read().split(b'\0')
+        with open('/proc/{}/stat'.format(pid), 'r') as reader:
+            ticks = int(reader.read().rpartition(')')[2].split()[19])
+        with open('/proc/stat', 'r') as reader:
+            boot = [int(o.split()[1]) for o in reader if o.startswith('btime ')][0]
+    except (OSError, IndexError, ValueError):
+        return False
+    program = os.path.basename(process.get('command', '').split(' ', 1)[0])
+    if os.path.basename(argv[0].decode('utf-8', 'replace')) != program:
+        return False
+    started = boot + ticks / float(os.sysconf('SC_CLK_TCK'))
+    return not process.get('started') or abs(started - process['started']) < START_TOLERANCE
+
+
+async def terminate_pid(pid, timeout):
+    try:
+        os.kill(pid, signal.SIGTERM)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            await asyncio.sleep(0.1)
+            os.kill(pid, 0)
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def stop_processes(workspace, prefixes=None, timeout=10):
+    # Gracefully stop this workspace processes, everything when prefixes is empty
+    if supervisor_running(workspace):
+        request = {'stop': prefixes or [], 'timeout': timeout}
+        if not prefixes:
+            request['shutdown'] = True
+        return supervisor_request(workspace, request, timeout + 30).get('stopped', [])
+
+    # supervisor is gone, fall back on the recorded PIDs
+    processes = read_processes(workspace)
+    names = [name for name in processes if not prefixes or name.startswith(tuple(prefixes))]
+    pids = []
+    for name in names:
+        process = processes[name]
+        if not process.get('pid') or process.get('status') not in ('running', 'stopping'):
+            continue
+        if process_matches(process['pid'], process):
+            pids.append(process['pid'])
+        else:
+            logging.warning("{} pid {} is gone or now runs another program, not signalling it".format(
+                name, process['pid']))
+
+    async def terminate_all():
+        await asyncio.gather(*[terminate_pid(pid, timeout) for pid in pids])
+    asyncio.run(terminate_all())
+    write_processes(workspace, {name: o for name, o in processes.items() if name not in names})
+    return names
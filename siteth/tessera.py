@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import base64
+import socket
+import logging
+import subprocess
+
+from siteth.config import TESSERA
+from siteth.logs import LOG_SIZE, LOG_FILES
+from siteth.supervisor import supervise
+
+
+def tessera_key_valid(path):
+    # path.pub is a base64 curve25519 public key, path.key the JSON private key document
+    try:
+        with open(path + '.pub', 'r') as reader:
+            if len(base64.b64decode(reader.read().strip(), validate=True)) != 32:
+                return False
+        with open(path + '.key', 'r') as reader:
+            return 'data' in json.load(reader)
+    except (OSError, ValueError):
+        return False
+
+
+def generate_tessera_keys(workspace, nodes):
+    # All node keypairs from one JVM with a comma separated -filename. Keys are unlocked, so every password
+    # prompt (password + confirmation per key) is answered with a blank line
+    nodes = list(nodes)
+    if ',' in workspace:
+        raise RuntimeError("Tessera keygen can't handle ',' in the workspace path {}".format(workspace))
+    keys = [os.path.join(workspace, 'net-info', 'tessera', 'node-{}-tx'.format(node), 'node-tx-key') for node in nodes]
+    started = time.time()
+    process = subprocess.run(['java', '-jar', TESSERA, '-keygen', '-filename', ','.join(keys)],
+                             input='\n' * (2 * len(keys)), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             universal_newlines=True)
+
+    invalid = [node for node, key in zip(nodes, keys) if not tessera_key_valid(key)]
+    if process.returncode != 0 or invalid:
+        for line in process.stdout.strip().splitlines()[-10:]:
+            logging.error("tessera keygen: {}".format(line))
+        raise RuntimeError("Tessera keygen failed (exit code {}), missing or invalid keys for node(s) {}".format(
+            process.returncode, invalid))
+    logging.info("Generated {} Tessera keypairs in {:.1f}s".format(len(keys), time.time() - started))
+
+
+def start_tessera(workspace, topology, debug_target=(), restart=False, stop_timeout=10, log_size=LOG_SIZE,
+                  log_files=LOG_FILES, placements=None):
+    # Launch every Tessera JVM at once under the supervisor, readiness is handled by wait_tessera.
+    # placements: {'tessera-N': placement} as planned by siteth.placement
+    for node in topology.indexes():
+        nodetx = topology.tessera_dir(node)
+        # clean transaction manager IPC
+        tm = os.path.join(nodetx, 'tm.ipc')
+        if os.path.exists(tm):
+            os.remove(tm)
+        placement = (placements or {}).get('tessera-{}'.format(node))
+        options = []
+        if node in debug_target:
+            options.append('-Xdebug -Xrunjdwp:transport=dt_socket,address=localhost:{},server=y,suspend=n'.format(
+                topology.node(node).tessera_debug))
+        # the JVM reserves far more address space than it uses, size it from the limit rather than RLIMIT_AS
+        if placement and placement.get('memory'):
+            options.append('-XX:MaxRAM={}m'.format(placement['memory']))
+        exec = ' '.join(['java'] + options + ['-jar', TESSERA, '-configfile',
+                                              os.path.join(nodetx, 'tessera-config.json')])
+        supervise(workspace, 'tessera-{}'.format(node), exec, os.path.join(nodetx, 'tessera.log'),
+                  restart=restart, stop_timeout=stop_timeout, log_size=log_size, log_files=log_files,
+                  placement=placement)
+
+
+def tessera_upcheck(tm):
+    # Probe the Q2T unix socket, an existing tm.ipc file is not enough as the JVM binds before serving
+    if not os.path.exists(tm):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1)
+            client.connect(tm)
+            client.sendall(b"GET /upcheck HTTP/1.0\r\nHost: localhost\r\n\r\n")
+            return b" 200" in client.recv(64).split(b"\r\n")[0]
+    except OSError:
+        return False
+
+
+def wait_tessera(workspace, size, timeout=120, interval=0.1):
+    # Wait for each node Q2T socket to answer, log per node time-to-ready and fail on timeout
+    started = time.time()
+    pending = set(range(1, size + 1))
+    while pending:
+        for node in sorted(pending):
+            if tessera_upcheck(os.path.join(workspace, 'net-info', 'tessera', 'node-{}-tx'.format(node), 'tm.ipc')):
+                pending.discard(node)
+                logging.info("Tessera node-{}-tx ready in {:.1f}s".format(node, time.time() - started))
+        if pending and time.time() - started > timeout:
+            for node in sorted(pending):
+                logging.error("Tessera node-{}-tx not ready after {}s, see {}".format(
+                    node, timeout,
+                    os.path.join(workspace, 'net-info', 'tessera', 'node-{}-tx'.format(node), 'tessera.log')))
+            raise RuntimeError("Tessera nodes {} not ready after {}s".format(sorted(pending), timeout))
+        if pending:
+            time.sleep(interval)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import random
+import socket
+import logging
+from collections import namedtuple
+
+# net-info/topology.json: every node ports, enode & paths relative to the workspace, written by --build.
+# Ports are None when the role does not apply: raft on istanbul, Tessera without --private. peers: nodes listed in
+# node-N/static-nodes.json
+TOPOLOGY_VERSION = 2
+Node = namedtuple('Node', ('node', 'enode', 'datadir', 'p2p', 'raft', 'rpc',
+                           'tessera', 'tessera_p2p', 'tessera_thirdparty', 'tessera_debug', 'peers'))
+GRAPHS = ('mesh', 'ring', 'kregular', 'hub')
+# Loaded topologies by path, reloaded when topology.json changes
+TOPOLOGIES = {}
+
+
+class Topology(object):
+
+    def __init__(self, workspace, consensus, nodes):
+        self.workspace = workspace
+        self.consensus = consensus
+        self.nodes = tuple(nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def node(self, node):
+        if not 1 <= int(node) <= len(self.nodes):
+            raise RuntimeError("Node {} is not part of the {} nodes network".format(node, len(self.nodes)))
+        return self.nodes[int(node) - 1]
+
+    def indexes(self, skip=()):
+        return [o.node for o in self.nodes if str(o.node) not in skip]
+
+    def rpc_ports(self, nodes=None):
+        # {node: rpc port}
+        return {o.node: o.rpc for o in self.nodes if nodes is None or o.node in nodes}
+
+    def datadir(self, node):
+        return os.path.join(self.workspace, self.node(node).datadir)
+
+    def tessera_dir(self, node):
+        tessera = self.node(node).tessera
+        return os.path.join(self.workspace, tessera) if tessera else None
+
+    @property
+    def private(self):
+        return any([o.tessera for o in self.nodes])
+
+    def enode_url(self, node):
+        node = self.node(node)
+        if node.raft is None:
+            return 'enode://{}@127.0.0.1:{}?discport=0'.format(node.enode, node.p2p)
+        return 'enode://{}@127.0.0.1:{}?discport=0&raftport={}&rpcport={}'.format(node.enode, node.p2p, node.raft,
+                                                                                  node.rpc)
+
+    def static_nodes(self, node=None):
+        # Every node, or the peers of one node for its node-N/static-nodes.json
+        if node is None:
+            return [self.enode_url(o.node) for o in self.nodes]
+        return [self.enode_url(o) for o in self.node(node).peers]
+
+    @property
+    def connections(self):
+        return len(set([tuple(sorted((o.node, peer))) for o in self.nodes for peer in o.peers]))
+
+    def enode_ids(self):
+        return {o.enode: o.node for o in self.nodes}
+
+    def roles(self):
+        # {port: (node, role)} of the ports peers and clients connect to
+        roles = {}
+        for o in self.nodes:
+            for role, port in (('geth', o.p2p), ('raft', o.raft), ('rpc', o.rpc), ('tessera', o.tessera_p2p)):
+                if port:
+                    roles[port] = (o.node, role)
+        return roles
+
+    def ports(self, nodes=None):
+        # [(port, node, role)] of every port the network listens on
+        return [(port, o.node, role) for o in self.nodes if nodes is None or o.node in nodes
+                for role, port in (('geth', o.p2p), ('raft', o.raft), ('rpc', o.rpc), ('tessera', o.tessera_p2p),
+                                   ('tessera-thirdparty', o.tessera_thirdparty), ('tessera-debug', o.tessera_debug))
+                if port]
+
+
+def node_topology(workspace, consensus, enodes, p2p_start_port, raft_start_port, rpc_start_port):
+    # Node N listens on <start port> + N
+    return Topology(workspace, consensus, [
+        Node(node, enode, 'node-{}'.format(node), p2p_start_port + node,
+             raft_start_port + node if consensus == 'raft' else None, rpc_start_port + node, None, None, None, None,
+             tuple([o for o in range(1, len(enodes) + 1) if o != node]))
+        for node, enode in enumerate(enodes, 1)])
+
+
+def add_tessera(topology, p2p_start_port, thirdparty_start_port, debug_start_port):
+    return Topology(topology.workspace, topology.consensus, [
+        o._replace(tessera=os.path.join('net-info', 'tessera', 'node-{}-tx'.format(o.node)),
+                   tessera_p2p=p2p_start_port + o.node, tessera_thirdparty=thirdparty_start_port + o.node,
+                   tessera_debug=debug_start_port + o.node) for o in topology])
+
+
+def add_peers(topology, graph):
+    return Topology(topology.workspace, topology.consensus, [o._replace(peers=tuple(graph[o.node])) for o in topology])
+
+
+def shift_ports(topology, offset):
+    # Every port moved by offset, for a workspace imported next to a network using the same ranges
+    def shift(port):
+        return port + offset if port else port
+    return Topology(topology.workspace, topology.consensus, [
+        o._replace(p2p=shift(o.p2p), raft=shift(o.raft), rpc=shift(o.rpc), tessera_p2p=shift(o.tessera_p2p),
+                   tessera_thirdparty=shift(o.tessera_thirdparty), tessera_debug=shift(o.tessera_debug))
+        for o in topology])
+
+
+def connected(graph):
+    seen = set([1])
+    pending = [1]
+    while pending:
+        for peer in graph[pending.pop()]:
+            if peer not in seen:
+                seen.add(peer)
+                pending.append(peer)
+    return len(seen) == len(graph)
+
+
+def peer_graph(kind, size, degree=4, hubs=1, seed=None):
+    # {node: sorted peers} of an undirected peering graph over nodes 1..size
+    nodes = range(1, size + 1)
+    if kind == 'mesh' or size <= 2:
+        return {node: [o for o in nodes if o != node] for node in nodes}
+    if kind == 'ring':
+        return {node: sorted(set([(node - 2) % size + 1, node % size + 1])) for node in nodes}
+    if kind == 'hub':
+        if not 1 <= hubs < size:
+            raise RuntimeError("Hub topology needs between 1 and {} hubs".format(size - 1))
+        # hubs are the first nodes and peer with each other, every spoke peers with every hub
+        return {node: [o for o in nodes if o != node and (o <= hubs or node <= hubs)] for node in nodes}
+    if kind != 'kregular':
+        raise RuntimeError("Unknown topology {}, use {}".format(kind, ', '.join(GRAPHS)))
+
+    if not 2 <= degree < size or size * degree % 2:
+        raise RuntimeError("No {}-regular graph of {} nodes, the degree must be in 2..{} and size x degree even".format(
+            degree, size, size - 1))
+    generator = random.Random(seed)
+    # ring lattice (plus the opposite node for odd degrees), then degree preserving double edge swaps
+    lattice = set()
+    for node in range(size):
+        for step in range(1, degree // 2 + 1):
+            lattice.add(tuple(sorted((node + 1, (node + step) % size + 1))))
+        if degree % 2:
+            lattice.add(tuple(sorted((node + 1, (node + size // 2) % size + 1))))
+    for attempt in range(100):
+        edges = sorted(lattice)
+        present = set(edges)
+        for swap in range(10 * len(edges)):
+            i, j = generator.sample(range(len(edges)), 2)
+            (a, b), (c, d) = edges[i], edges[j]
+            if generator.random() < 0.5:
+                c, d = d, c
+            first, second = tuple(sorted((a, d))), tuple(sorted((c, b)))
+            if a == d or c == b or first in present or second in present:
+                continue
+            present.difference_update([edges[i], edges[j]])
+            present.update([first, second])
+            edges[i], edges[j] = first, second
+        graph = {node: [] for node in nodes}
+        for a, b in edges:
+            graph[a].append(b)
+            graph[b].append(a)
+        graph = {node: sorted(peers) for node, peers in graph.items()}
+        if connected(graph):
+            return graph
+    raise RuntimeError("Could not draw a connected {}-regular graph of {} nodes".format(degree, size))
+
+
+def busy_ports(ports):
+    # Ports a listener cannot bind on loopback. SO_REUSEADDR so sockets of a just stopped network in TIME_WAIT pass
+    busy = []
+    for port in ports:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                probe.bind(('127.0.0.1', port))
+            except OSError:
+                busy.append(port)
+    return busy
+
+
+def check_ports(topology):
+    # Fail on a port shared by two roles (overlapping start ports) or already bound by another process
+    owners = {}
+    for port, node, role in topology.ports():
+        owners.setdefault(port, []).append('node-{} {}'.format(node, role))
+    shared = ['{} ({})'.format(port, ', '.join(o)) for port, o in sorted(owners.items()) if len(o) > 1]
+    if shared:
+        raise RuntimeError("Port collisions, change the start ports: {}".format('; '.join(shared)))
+    busy = busy_ports(sorted(owners))
+    if busy:
+        raise RuntimeError("Ports already in use: {}. Stop the process using them or change the start ports".format(
+            ', '.join(['{} ({})'.format(port, owners[port][0]) for port in busy])))
+
+
+def write_topology(topology):
+    path = os.path.join(topology.workspace, 'net-info', 'topology.json')
+    with open(path + '.tmp', 'w') as writer:
+        json.dump({'version': TOPOLOGY_VERSION, 'consensus': topology.consensus,
+                   'nodes': [o._asdict() for o in topology]}, writer, indent=1)
+    os.replace(path + '.tmp', path)
+    TOPOLOGIES.pop(path, None)
+
+
+def legacy_topology(workspace, rpc_start_port, debug_start_port):
+    # Workspaces built before topology.json: parse static-nodes.json & Tessera configs once
+    logging.info("No net-info/topology.json, recovering it from static-nodes.json")
+    with open(os.path.join(workspace, 'net-info', 'static-nodes.json'), 'r') as reader:
+        staticNodes = json.load(reader)
+    consensus = 'istanbul' if os.path.exists(os.path.join(workspace, 'net-info', 'istanbul')) else 'raft'
+    nodes = []
+    for node, url in enumerate(staticNodes, 1):
+        enode, _, address = url.replace('enode://', '').partition('@')
+        hostPort, _, query = address.partition('?')
+        params = dict([o.partition('=')[::2] for o in query.split('&') if o])
+        nodes.append(Node(node, enode, 'node-{}'.format(node), int(hostPort.split(':')[-1]),
+                          int(params['raftport']) if 'raftport' in params else None,
+                          int(params.get('rpcport', rpc_start_port + node)), None, None, None, None,
+                          tuple([o for o in range(1, len(staticNodes) + 1) if o != node])))
+
+        tessera = os.path.join('net-info', 'tessera', 'node-{}-tx'.format(node))
+        if os.path.exists(os.path.join(workspace, tessera, 'tessera-config.json')):
+            with open(os.path.join(workspace, tessera, 'tessera-config.json'), 'r') as reader:
+                servers = {o['app']: o['serverAddress'] for o in json.load(reader)['serverConfigs']}
+            nodes[-1] = nodes[-1]._replace(tessera=tessera, tessera_p2p=int(servers['P2P'].split(':')[-1]),
+                                           tessera_thirdparty=int(servers['ThirdParty'].split(':')[-1]),
+                                           tessera_debug=debug_start_port + node)
+    return Topology(workspace, consensus, nodes)
+
+
+def load_topology(workspace, rpc_start_port=22000, debug_start_port=6900):
+    # Topology of a built workspace, start ports are only used to recover the topology of older workspaces. The
+    # recovered topology is not saved here, the Tessera debug ports are a guess: --run persists it
+    path = os.path.join(workspace, 'net-info', 'topology.json')
+    if not os.path.exists(path):
+        return legacy_topology(workspace, rpc_start_port, debug_start_port)
+    stamp = os.stat(path).st_mtime_ns
+    if path in TOPOLOGIES and TOPOLOGIES[path][0] == stamp:
+        return TOPOLOGIES[path][1]
+
+    with open(path, 'r') as reader:
+        data = json.load(reader)
+    if data.get('version') != TOPOLOGY_VERSION:
+        raise RuntimeError("{} version {} is not supported, rebuild the workspace".format(path, data.get('version')))
+    topology = Topology(workspace, data['consensus'], [Node(**dict(o, peers=tuple(o['peers']))) for o in data['nodes']])
+    TOPOLOGIES[path] = (stamp, topology)
+    return topology
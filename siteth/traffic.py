@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import mmap
+import struct
+import logging
+
+from siteth.pcap import PCAP_MAGIC, LINKTYPES, tcp_ports, ring_files
+
+# Flow index of capture files, saved as <capture>.pcap.idx.json. Packets are grouped in blocks of INDEX_BLOCK
+# records, each block keeps its file offset, time range and per flow counters so queries only read matching blocks
+INDEX_VERSION = 2
+INDEX_BLOCK = 4096
+# Enough of each frame for link, IP and TCP headers
+HEADER_BYTES = 256
+
+
+def find_session(workspace, name=None):
+    # Folder of the named sniff session, latest one when name is empty
+    traffic = os.path.join(workspace, 'net-info', 'traffic')
+    sessions = [o for o in os.listdir(traffic) if os.path.exists(os.path.join(traffic, o, 'capture.json'))]
+    if not name:
+        if not sessions:
+            raise RuntimeError("No sniff session can be found in {}".format(traffic))
+        name = max(sessions, key=lambda o: os.path.getmtime(os.path.join(traffic, o)))
+    if name not in sessions:
+        raise RuntimeError("{} is not a sniff session".format(os.path.join(traffic, name)))
+    return os.path.join(traffic, name)
+
+
+def session_roles(session):
+    # {port: (node, role)}, sessions captured before roles were recorded only know geth vs tessera
+    with open(os.path.join(session, 'capture.json'), 'r') as reader:
+        capture = json.load(reader)
+    if 'roles' in capture:
+        return {int(port): tuple(o) for port, o in capture['roles'].items()}
+    return {int(port): (0, 'tessera' if path.startswith('tessera') else 'geth')
+            for port, path in capture['targets'].items()}
+
+
+def packet_flow(ports, roles):
+    # (node, role, direction) of a TCP packet, traffic towards a known port is `in`, from it `out`
+    if ports is None:
+        return None
+    if ports[1] in roles:
+        return roles[ports[1]] + ('in',)
+    if ports[0] in roles:
+        return roles[ports[0]] + ('out',)
+    return None
+
+
+def read_records(mm, offset, end, order, nanos):
+    # Yield (offset, timestamp, captured length, wire length) of the records in mm[offset:end]
+    while offset + 16 <= end:
+        seconds, fraction, length, wire = struct.unpack_from(order + 'IIII', mm, offset)
+        if offset + 16 + length > end:
+            return
+        yield offset, seconds + fraction / (1e9 if nanos else 1e6), length, wire
+        offset = offset + 16 + length
+
+
+def build_index(path, roles):
+    with open(path, 'rb') as reader:
+        size = os.fstat(reader.fileno()).st_size
+        if size < 24:
+            raise RuntimeError("{} is not a pcap file".format(path))
+        mm = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic = mm[:4]
+            if magic not in PCAP_MAGIC:
+                raise RuntimeError("{} is not a pcap file".format(path))
+            order = PCAP_MAGIC[magic]
+            nanos = magic in (b'\x4d\x3c\xb2\xa1', b'\xa1\xb2\x3c\x4d')
+            linktype = struct.unpack_from(order + 'I', mm, 20)[0] & 0x0FFFFFFF
+            if linktype not in LINKTYPES:
+                raise RuntimeError("Unsupported pcap link type {} in {}".format(linktype, path))
+
+            flows = []
+            ids = {}
+            blocks = []
+            block = None
+            end = 24
+            for offset, timestamp, length, wire in read_records(mm, 24, size, order, nanos):
+                if block is None or block['records'] == INDEX_BLOCK:
+                    block = {'offset': offset, 'first': timestamp, 'last': timestamp, 'records': 0, 'flows': {}}
+                    blocks.append(block)
+                block['records'] = block['records'] + 1
+                block['first'] = min(block['first'], timestamp)
+                block['last'] = max(block['last'], timestamp)
+                end = offset + 16 + length
+
+                flow = packet_flow(tcp_ports(mm[offset + 16:offset + 16 + min(length, HEADER_BYTES)],
+                                             LINKTYPES[linktype]), roles)
+                if flow is None:
+                    continue
+                if flow not in ids:
+                    ids[flow] = len(flows)
+                    flows.append(list(flow))
+                counters = block['flows'].setdefault(ids[flow], [0, 0, timestamp, timestamp])
+                counters[0] = counters[0] + 1
+                counters[1] = counters[1] + wire
+                counters[2] = min(counters[2], timestamp)
+                counters[3] = max(counters[3], timestamp)
+        finally:
+            mm.close()
+
+    return {'version': INDEX_VERSION, 'size': size, 'end': end, 'order': order, 'nanos': nanos,
+            'linktype': linktype, 'roles': sorted([[port] + list(o) for port, o in roles.items()]),
+            'flows': flows,
+            'blocks': [[o['offset'], o['first'], o['last'], o['records'],
+                        [[flow] + counters for flow, counters in sorted(o['flows'].items())]]
+                       for o in blocks]}
+
+
+def load_index(path, roles):
+    # Index of one capture file, rebuilt when the file changed (ring file still being written) or roles differ
+    indexPath = path + '.idx.json'
+    size = os.path.getsize(path)
+    if os.path.exists(indexPath):
+        with open(indexPath, 'r') as reader:
+            index = json.load(reader)
+        if index.get('version') == INDEX_VERSION and index.get('size') == size and \
+                index.get('roles') == sorted([[port] + list(o) for port, o in roles.items()]):
+            return index
+
+    logging.info("Indexing {}".format(path))
+    index = build_index(path, roles)
+    with open(indexPath + '.tmp', 'w') as writer:
+        json.dump(index, writer, separators=(',', ':'))
+    os.replace(indexPath + '.tmp', indexPath)
+    return index
+
+
+def session_indexes(session):
+    capture = os.path.join(session, 'capture')
+    roles = session_roles(session)
+    # a ring file tshark just created may not have its header yet
+    paths = [o for o in ring_files(capture) if os.path.getsize(o) >= 24]
+    # drop indexes of ring files tshark already recycled
+    for name in os.listdir(capture):
+        if name.endswith('.idx.json') and os.path.join(capture, name[:-len('.idx.json')]) not in paths:
+            os.remove(os.path.join(capture, name))
+    return roles, [(path, load_index(path, roles)) for path in paths]
+
+
+def query_session(session, node=None, port=None, start=None, end=None, output=None):
+    # Totals per (node, role, direction) for packets matching node/port and the [start, end] epoch window.
+    # Blocks without a matching flow are skipped, blocks fully inside the window are answered from the index and
+    # the others are re-read through mmap from their offset. output, when set, receives the matching packets as pcap
+    roles, indexes = session_indexes(session)
+    if port is not None and port not in roles:
+        raise RuntimeError("Port {} is not part of the capture".format(port))
+    wanted = lambda flow: (node is None or flow[0] == node) and (port is None or roles[port][:2] == tuple(flow[:2]))
+    start = float('-inf') if start is None else start
+    end = float('inf') if end is None else end
+
+    totals = {}
+    writer = open(output, 'wb') if output else None
+    try:
+        for path, index in indexes:
+            flows = [tuple(o) for o in index['flows']]
+            blocks = index['blocks']
+            # header of the first file for the exported pcap
+            if writer and writer.tell() == 0:
+                with open(path, 'rb') as reader:
+                    writer.write(reader.read(24))
+            with open(path, 'rb') as reader:
+                mm = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    for position, (offset, first, last, records, counters) in enumerate(blocks):
+                        if last < start or first > end:
+                            continue
+                        if not [o for o in counters if wanted(flows[o[0]])]:
+                            continue
+                        if writer is None and start <= first and last <= end:
+                            for flow, packets, size, flowFirst, flowLast in counters:
+                                if wanted(flows[flow]):
+                                    add_flow(totals, flows[flow], packets, size, flowFirst, flowLast)
+                            continue
+
+                        blockEnd = blocks[position + 1][0] if position + 1 < len(blocks) else index['end']
+                        for record, timestamp, length, wire in read_records(mm, offset, blockEnd, index['order'],
+                                                                      index['nanos']):
+                            if not start <= timestamp <= end:
+                                continue
+                            flow = packet_flow(tcp_ports(mm[record + 16:record + 16 + min(length, HEADER_BYTES)],
+                                                         LINKTYPES[index['linktype']]), roles)
+                            if flow is None or not wanted(flow):
+                                continue
+                            add_flow(totals, flow, 1, wire, timestamp, timestamp)
+                            if writer:
+                                writer.write(mm[record:record + 16 + length])
+                finally:
+                    mm.close()
+    finally:
+        if writer:
+            writer.close()
+    return totals
+
+
+def add_flow(totals, flow, packets, size, first, last):
+    entry = totals.setdefault(tuple(flow), [0, 0, first, last])
+    entry[0] = entry[0] + packets
+    entry[1] = entry[1] + size
+    entry[2] = min(entry[2], first)
+    entry[3] = max(entry[3], last)
+
+
+def session_start(session):
+    roles, indexes = session_indexes(session)
+    firsts = [index['blocks'][0][1] for path, index in indexes if index['blocks']]
+    return min(firsts) if firsts else 0.0
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import random
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from siteth.ipc import IPCClient
+from siteth.rpc import rpc_batch, wait_rpc
+
+
+def unlock_node_accounts(session, node, port, accounts, duration=0, timeout=60):
+    wait_rpc(session, port, timeout)
+    responses = rpc_batch(session, port, [('personal_unlockAccount', [o['account'], o['pass'], duration])
+                                          for o in accounts], timeout)
+    return [(o['account'], r.get('result') is True, r.get('error', {}).get('message'))
+            for o, r in zip(accounts, responses)]
+
+
+def unlock_ipc_accounts(path, accounts, duration=0, timeout=60):
+    # Over geth.ipc, which serves the personal API whatever --rpcapi (or custom --gethParams) enables
+    client = IPCClient(path, timeout)
+    try:
+        responses = client.batch([('personal_unlockAccount', [o['account'], o['pass'], duration]) for o in accounts])
+    finally:
+        client.close()
+    return [(o['account'], r.get('result') is True, r.get('error', {}).get('message'))
+            for o, r in zip(accounts, responses)]
+
+
+def unlock_accounts(ipcs, accounts, count=1, duration=0, timeout=60):
+    # Unlock `count` random accounts on every node ({node: geth.ipc path}) concurrently
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(len(ipcs), 32))) as pool:
+        futures = {pool.submit(unlock_ipc_accounts, path, random.sample(accounts, min(count, len(accounts))),
+                               duration, timeout): node
+                   for node, path in sorted(ipcs.items())}
+        for future in as_completed(futures):
+            node = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                failed = failed + 1
+                logging.error("Node:{} unlock failed: {}".format(node, e))
+                continue
+            for account, unlocked, error in results:
+                if unlocked:
+                    logging.info("Node:{} Account:{} unlocked".format(node, account))
+                else:
+                    failed = failed + 1
+                    logging.error("Node:{} Account:{} unlock failed: {}".format(node, account, error))
+    return failed == 0
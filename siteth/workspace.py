@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import logging
+
+
+def read_workspace_settings(workspace):
+    settings = os.path.join(workspace, 'net-info', 'workspace.json')
+    if not os.path.exists(settings):
+        return {}
+    with open(settings, 'r') as reader:
+        return json.load(reader)
+
+
+def write_workspace_settings(workspace, **values):
+    settings = read_workspace_settings(workspace)
+    settings.update(values)
+    with open(os.path.join(workspace, 'net-info', 'workspace.json'), 'w') as writer:
+        json.dump(settings, writer)
+
+
+def share_keystore(workspace, size, mode='hardlink'):
+    # Give every node access to net-info/keystore, hardlinks fall back to copy when the filesystem can't link
+    keystore = os.path.join(workspace, 'net-info', 'keystore')
+    if mode == 'hardlink':
+        try:
+            for node in range(1, size + 1):
+                nodeKeystore = os.path.join(workspace, 'node-{}'.format(node), 'keystore')
+                os.makedirs(nodeKeystore, exist_ok=True)
+                for key in os.listdir(keystore):
+                    os.link(os.path.join(keystore, key), os.path.join(nodeKeystore, key))
+        except OSError as e:
+            logging.warning("Keystore hardlink failed ({}), falling back to copy".format(e))
+            for node in range(1, size + 1):
+                shutil.rmtree(os.path.join(workspace, 'node-{}'.format(node), 'keystore'), ignore_errors=True)
+            mode = 'copy'
+
+    if mode == 'copy':
+        for node in range(1, size + 1):
+            shutil.copytree(keystore, os.path.join(workspace, 'node-{}'.format(node), 'keystore'))
+
+    write_workspace_settings(workspace, keystore=mode)
+    logging.info("Keystore mode: {}".format(mode))
+
+
+def read_processes(workspace):
+    processes = os.path.join(workspace, 'net-info', 'processes.json')
+    if not os.path.exists(processes):
+        return {}
+    with open(processes, 'r') as reader:
+        return json.load(reader)
+
+
+def write_processes(workspace, processes):
+    path = os.path.join(workspace, 'net-info', 'processes.json')
+    with open(path + '.tmp', 'w') as writer:
+        json.dump(processes, writer)
+    os.replace(path + '.tmp', path)
+
+
+def running_processes(workspace, prefixes=None):
+    # Names of recorded processes whose pid is still alive
+    running = []
+    for name, process in read_processes(workspace).items():
+        if prefixes and not name.startswith(tuple(prefixes)):
+            continue
+        if not process.get('pid') or process.get('status') not in ('starting', 'running', 'stopping'):
+            continue
+        try:
+            os.kill(process['pid'], 0)
+            running.append(name)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            running.append(name)
+    return sorted(running)